@@ -0,0 +1,89 @@
+"""
+페이지별 첫 화면까지 걸리는 시간 (time-to-first-interactive) 측정
+
+페이지마다 새 파이썬 프로세스(= 배포 직후 새 워커)를 띄우고,
+streamlit 을 import 한 뒤부터 페이지 스크립트 첫 실행이 끝날 때까지의 시간을 잰다.
+
+    python bench/cold_start.py [--repeat N] [--no-artifacts] [페이지 이름 일부 ...]
+
+모드
+- off  : 백그라운드 준비 끔 (APP_WARMUP=0) — 페이지가 import·로드를 모두 직접 한다
+         (페이지 주소로 바로 들어온 첫 방문자와 같다)
+- warm : main.py 에서 시작한 준비가 끝난 뒤 페이지에 들어옴
+
+--no-artifacts 를 주면 빈 캐시 폴더에서 시작한다 (미리 만든 데이터 파일 없이 배포한 경우).
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+page, mode = sys.argv[1], sys.argv[2]
+warmup_s = None
+if mode == "warm":
+    from core import warmup
+    start = time.perf_counter()
+    warmup.start()
+    warmup.wait()
+    warmup_s = time.perf_counter() - start
+
+start = time.perf_counter()
+at = AppTest.from_file(page, default_timeout=300).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "warmup": warmup_s, "error": bool(at.exception)}))
+"""
+
+MODES = ["off", "warm"]
+
+
+def run_once(page, mode, cache_dir):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONWARNINGS="ignore")
+    env["APP_WARMUP"] = "0" if mode == "off" else "1"
+    if cache_dir is not None:
+        env["APP_CACHE_DIR"] = cache_dir
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, page, mode],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="측정할 페이지 파일 이름 일부 (없으면 전부)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-artifacts", action="store_true")
+    args = parser.parse_args()
+
+    pages = [os.path.join(ROOT, "main.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+    if args.pages:
+        pages = [p for p in pages if any(name in os.path.basename(p) for name in args.pages)]
+
+    print(f"{'페이지':<28}" + "".join(f"{mode:>10}" for mode in MODES))
+    for page in pages:
+        row = []
+        for mode in MODES:
+            samples = []
+            for _ in range(args.repeat):
+                # --no-artifacts: 반복마다 빈 캐시 폴더 (매번 배포 직후와 같은 상태)
+                with tempfile.TemporaryDirectory() as tmp:
+                    result = run_once(page, mode, tmp if args.no_artifacts else None)
+                if result["error"]:
+                    raise SystemExit(f"{page} ({mode}) 실행 중 예외")
+                samples.append(result["seconds"])
+            row.append(statistics.median(samples))
+        print(f"{os.path.basename(page):<28}" + "".join(f"{s:>9.2f}s" for s in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""
+동시 접속 부하 테스트 (Streamlit 웹소켓 프로토콜)
+
+앱 서버(streamlit run main.py)를 로컬에 띄우고, 브라우저 세션 N개를 흉내 낸다.
+각 세션은 /_stcore/stream 웹소켓으로 BackMsg(rerun_script)를 보내고,
+ForwardMsg 를 script_finished 까지 받는 것을 rerun 한 번으로 센다.
+
+- 세션마다 페이지 02~05 를 돌며 bench/pages.py 의 시나리오(--quick 크기)를 그대로 재생한다.
+  받은 delta 로 streamlit.testing 의 요소 트리를 만들어 위젯 값을 바꾸고,
+  그 위젯 상태를 다음 rerun 에 실어 보낸다.
+- 브라우저처럼 큰 메시지는 hash 로 기억해 두고 cached_message_hashes 로 알려 준다
+  (서버는 같은 메시지를 ref_hash 로만 보낸다). --no-browser-cache 로 끌 수 있다.
+- 서버 프로세스의 CPU·RSS 를 /proc 에서 주기적으로 읽는다 (Linux).
+
+동시 세션 수를 단계별로 올리며 rerun 지연 p50/p95/p99, 처리량, 받은 바이트, CPU, RSS 를 보고한다.
+시나리오 오류가 나도 세션은 다음 페이지로 넘어가고 끊기면 다시 접속하며,
+실제로 연결되어 있던 평균 세션 수("실제")와 오류 건수를 함께 보고한다::
+
+    python bench/load.py --sessions 1,4,8,16 --duration 30 [--think 0.5] [--out load.json]
+    python bench/load.py --url ws://host:8501 --pid 1234 ...   # 이미 떠 있는 서버에 붙기
+
+앱 의존성 외에 websockets(12 이상, sync 클라이언트)가 필요하다::
+
+    pip install -r bench/requirements.txt
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.runtime.state.common import TESTING_KEY
+from streamlit.testing.v1.element_tree import InitialValue, Widget, parse_tree_from_messages
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["02_관광지", "03_MBTI분석", "04_지하철분석", "05_수행평가"]
+
+
+def _load_scenarios():
+    spec = importlib.util.spec_from_file_location("bench_pages", os.path.join(ROOT, "bench", "pages.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SCENARIOS
+
+
+SCENARIOS = _load_scenarios()
+
+
+# -------------------------------
+# 서버 실행과 /proc 샘플링
+# -------------------------------
+def start_server(port, warmup):
+    env = dict(os.environ, APP_WARMUP="1" if warmup else "0", PYTHONPATH=ROOT)
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "main.py"),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("서버가 60초 안에 뜨지 않았습니다")
+
+
+class ProcSampler(threading.Thread):
+    """pid 의 CPU 사용률(%)·RSS(MB)를 interval 초마다 기록"""
+
+    def __init__(self, pid, interval=0.5):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []   # (시각, cpu %, rss MB)
+        self._stop = threading.Event()
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._page_kb = os.sysconf("SC_PAGE_SIZE") / 1024
+
+    def _read(self):
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / self._ticks   # utime + stime
+        with open(f"/proc/{self.pid}/statm") as f:
+            rss_mb = int(f.read().split()[1]) * self._page_kb / 1024
+        return cpu, rss_mb
+
+    def run(self):
+        last_cpu, _ = self._read()
+        last_t = time.monotonic()
+        while not self._stop.wait(self.interval):
+            try:
+                cpu, rss = self._read()
+            except OSError:
+                return
+            now = time.monotonic()
+            self.samples.append((time.time(), 100 * (cpu - last_cpu) / (now - last_t), rss))
+            last_cpu, last_t = cpu, now
+
+    def stop(self):
+        self._stop.set()
+
+
+# -------------------------------
+# 세션 하나
+# -------------------------------
+class _LiveTree:
+    """시나리오가 항상 마지막 rerun 결과 트리를 보게 하는 대리 객체"""
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session.tree, name)
+
+
+class _RemoteRunner:
+    """
+    서버의 session_state 는 이쪽에서 볼 수 없으므로, 요소 트리가 위젯 값을 직렬화할 때
+    찾는 format_func 만 채워 둔다. 서버가 보낸 선택지는 이미 문자열로 바뀌어 있어 str 로 충분하다.
+    """
+
+    def __init__(self):
+        self._session_state = {TESTING_KEY: _AnyKey(str)}
+        self._cleared_form_ids = set()
+
+
+class _AnyKey(dict):
+    def __init__(self, value):
+        super().__init__()
+        self._value = value
+
+    def __missing__(self, key):
+        return self._value
+
+
+class Session:
+    def __init__(self, ws, browser_cache=True):
+        self.ws = ws
+        self.browser_cache = browser_cache
+        self.cache = {}         # hash → ForwardMsg (브라우저 메시지 캐시)
+        self.widgets = {}       # 위젯 id → 마지막으로 보낸 WidgetState (브라우저가 기억하는 값)
+        self.pages = {}         # url 경로 → page_script_hash (navigation 메시지)
+        self.page_hash = ""
+        self.tree = None
+        self.records = []       # (보낸 시각, 지연 초, 받은 바이트, 페이지)
+
+    def rerun(self, widget_states=None, page_hash=None):
+        if page_hash is not None:
+            self.page_hash = page_hash
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = ""
+        state.page_script_hash = self.page_hash
+        if widget_states is not None:
+            state.widget_states.CopyFrom(widget_states)
+        if self.browser_cache:
+            state.cached_message_hashes.extend(self.cache)
+
+        sent = time.time()
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        deltas, received = [], 0
+        while True:
+            raw = self.ws.recv(timeout=300)
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "ref_hash":
+                cached = ForwardMsg()
+                cached.CopyFrom(self.cache[fwd.ref_hash])
+                cached.metadata.CopyFrom(fwd.metadata)
+                fwd, kind = cached, cached.WhichOneof("type")
+            elif fwd.metadata.cacheable and self.browser_cache:
+                self.cache[fwd.hash] = fwd
+            if kind == "navigation":
+                self.pages = {p.url_pathname: p.page_script_hash for p in fwd.navigation.app_pages}
+            elif kind == "delta":
+                deltas.append(fwd)
+            elif kind == "script_finished":
+                if fwd.script_finished in (ForwardMsg.FINISHED_SUCCESSFULLY,
+                                           ForwardMsg.FINISHED_EARLY_FOR_RERUN,
+                                           ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY):
+                    break
+                raise RuntimeError(f"script_finished={fwd.script_finished}")
+        self.records.append((sent, time.perf_counter() - start, received, self.page_hash))
+        self.tree = parse_tree_from_messages(deltas)
+        self.tree._runner = _RemoteRunner()
+
+    def widget_states(self):
+        """
+        시나리오가 바꾼 위젯 값을 지금까지 보낸 값에 더한다. 손대지 않은 위젯은 보내지 않아도
+        서버가 지난 값(또는 기본값)을 그대로 쓴다. 버튼처럼 한 번만 쓰이는 값은 기억하지 않는다.
+        """
+        changed = {}
+        for node in self.tree:
+            if isinstance(node, Widget) and node._value is not None and not isinstance(node._value, InitialValue):
+                changed[node.id] = node._widget_state
+        states = WidgetStates()
+        states.widgets.extend({**self.widgets, **changed}.values())
+        self.widgets.update(
+            (wid, state) for wid, state in changed.items()
+            if state.WhichOneof("value") not in ("trigger_value", "string_trigger_value", "json_trigger_value", "chat_input_value")
+        )
+        return states
+
+    def open_page(self, name):
+        """
+        name 이 들어간 url 경로의 페이지로 이동.
+        지금 있는 페이지를 다시 열면 서버가 지난 위젯 값을 그대로 쓰므로(시나리오가 다른 화면에서
+        시작하게 된다), 첫 화면(main.py)을 한 번 거쳐 서버의 위젯 상태를 비운다.
+        """
+        path = next(p for p in self.pages if p and p in name)
+        if self.pages[path] == self.page_hash:
+            self.widgets = {}
+            self.rerun(page_hash=self.pages.get("", ""))
+        self.widgets = {}   # 브라우저도 화면에서 사라진 위젯의 값은 버린다
+        self.rerun(page_hash=self.pages[path])
+
+    def replay(self, page, think):
+        """페이지에 들어가서 bench/pages.py 의 시나리오(quick)를 그대로 따라간다"""
+        self.open_page(page)
+        live = _LiveTree(self)
+
+        def step(action):
+            action(live)
+            time.sleep(think * random.uniform(0.5, 1.5))
+            self.rerun(self.widget_states())
+
+        SCENARIOS[page[:2]](live, step, True)
+
+
+def session_loop(url, stop_at, think, browser_cache, results, errors, live):
+    """
+    stop_at 까지 페이지를 돌며 시나리오를 재생한다.
+    시나리오 도중 오류가 나면 기록하고 다음 페이지로 넘어가며, 연결이 끊기면 다시 접속한다.
+    live 에는 실제로 연결되어 있던 시간(초)을 더한다 (단계의 실제 동시 세션 수 계산용).
+    """
+    pages = list(PAGES)
+    while time.time() < stop_at:
+        session = None
+        connected = time.time()
+        try:
+            with connect(f"{url}/_stcore/stream", subprotocols=["streamlit"], max_size=None,
+                         open_timeout=30) as ws:
+                session = Session(ws, browser_cache)
+                session.rerun()  # 첫 화면 (main.py) — navigation 메시지로 페이지 목록을 받는다
+                while time.time() < stop_at:
+                    random.shuffle(pages)
+                    for page in pages:
+                        if time.time() >= stop_at:
+                            break
+                        try:
+                            session.replay(page, think)
+                        except (ConnectionClosed, OSError):
+                            raise
+                        except Exception as exc:
+                            errors.append(f"{page}: {type(exc).__name__}: {exc}")
+        except Exception as exc:
+            errors.append(f"연결: {type(exc).__name__}: {exc}")
+            time.sleep(1)
+        finally:
+            live.append(time.time() - connected)
+            if session is not None:
+                results.extend(session.records)
+
+
+# -------------------------------
+# 보고
+# -------------------------------
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else float("nan")
+
+
+def summarize(level, records, samples, errors, live, seconds):
+    latencies = [r[1] * 1000 for r in records]
+    cpu = [s[1] for s in samples]
+    rss = [s[2] for s in samples]
+    return {
+        "sessions": level,
+        "sessions_live": round(sum(live) / seconds, 2),  # 연결되어 있던 시간으로 잰 평균 동시 세션 수
+        "error_count": len(errors),
+        "reruns": len(records),
+        "reruns_per_s": round(len(records) / seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "kb_per_rerun": round(statistics.mean(r[2] for r in records) / 1024, 1) if records else 0.0,
+        "cpu_avg": round(statistics.mean(cpu), 1) if cpu else 0.0,
+        "cpu_max": round(max(cpu), 1) if cpu else 0.0,
+        "rss_max_mb": round(max(rss), 1) if rss else 0.0,
+        "errors": errors[:5],
+        "timeline": [[round(t, 2), round(c, 1), round(r, 1)] for t, c, r in samples],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", default="1,4,8,16", help="단계별 동시 세션 수 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=30, help="단계마다 부하를 거는 시간(초)")
+    parser.add_argument("--think", type=float, default=0.5, help="조작 사이 평균 대기(초), 0 이면 쉬지 않음")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (예: ws://127.0.0.1:8501)")
+    parser.add_argument("--pid", type=int, help="--url 서버의 프로세스 번호 (CPU·RSS 측정용)")
+    parser.add_argument("--warmup", action="store_true", help="서버의 백그라운드 준비(core.warmup) 켜기")
+    parser.add_argument("--no-browser-cache", action="store_true", help="브라우저 메시지 캐시 흉내 끄기")
+    parser.add_argument("--out", help="결과(JSON, 시간별 CPU·RSS 포함) 저장 경로")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        server = start_server(args.port, args.warmup)
+        url, pid = f"ws://127.0.0.1:{args.port}", server.pid
+
+    report = []
+    print(f"{'세션':>4}{'실제':>6}{'rerun':>7}{'rerun/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'KB/rerun':>10}"
+          f"{'CPU평균':>9}{'CPU최대':>9}{'RSS최대':>9}")
+    try:
+        for level in [int(n) for n in args.sessions.split(",")]:
+            sampler = ProcSampler(pid) if pid else None
+            if sampler:
+                sampler.start()
+            records, errors, live = [], [], []
+            start = time.time()
+            stop_at = start + args.duration
+            threads = [
+                threading.Thread(
+                    target=session_loop,
+                    args=(url, stop_at, args.think, not args.no_browser_cache, records, errors, live),
+                    daemon=True,
+                )
+                for _ in range(level)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.time() - start
+            if sampler:
+                sampler.stop()
+            row = summarize(level, records, sampler.samples if sampler else [], errors, live, elapsed)
+            report.append(row)
+            print(f"{level:>4}{row['sessions_live']:>6.1f}{row['reruns']:>7}{row['reruns_per_s']:>9}{row['p50_ms']:>7.0f}ms"
+                  f"{row['p95_ms']:>7.0f}ms{row['p99_ms']:>7.0f}ms{row['kb_per_rerun']:>10}"
+                  f"{row['cpu_avg']:>8.0f}%{row['cpu_max']:>8.0f}%{row['rss_max_mb']:>7.0f}MB")
+            if errors:
+                print(f"   오류 {len(errors)}건 (앞의 {len(row['errors'])}건):")
+            for error in row["errors"]:
+                print("   오류:", error)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+페이지별 성능 측정 (headless, streamlit AppTest) + 기준값 대비 회귀 검사
+
+main.py 와 pages/*.py 를 각각 새 파이썬 프로세스에서 AppTest 로 실행하고,
+페이지마다 정해 둔 위젯 조작 순서(시나리오)를 따라가며 아래를 기록한다.
+
+- first: 첫 실행 (import·데이터 로드 포함) — 걸린 시간, 최대 메모리, 남은 블록 수
+- warm : 그 뒤 위젯 조작마다 일어나는 rerun — 횟수, 중앙값·p95 시간, 최대 메모리, 남은 블록 수
+
+시간은 tracemalloc 없이 --repeat 번(기본 3) 실행해 중앙값을 쓰고,
+메모리는 tracemalloc 을 켜고 한 번 더 실행해서 잰다.
+페이지 자체만 재도록 main.py 의 백그라운드 준비(core.warmup)는 끈다 (APP_WARMUP=0).
+남은 블록 수(retained_blocks)는 sys.getallocatedblocks() 증가량, 즉 실행 후에도 살아 있는 블록 수이다
+(실행 중에 할당했다가 풀어 준 블록은 세지 않는다).
+
+    python bench/pages.py                 # 측정 후 bench/baseline.json 과 비교 (넘으면 종료 코드 1)
+    python bench/pages.py --update        # 측정 결과를 기준값으로 저장
+    python bench/pages.py --quick 04 05   # 일부 페이지만, 시나리오를 줄여서
+
+허용 범위는 baseline.json 의 "thresholds" 에 두며, 없으면 THRESHOLDS 를 쓴다.
+값이 기준값 × (1 + 비율) 과 기준값 + 최소폭 을 모두 넘으면 회귀로 본다 (작은 값의 흔들림은 무시).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+
+# 지표 → (허용 비율, 최소폭)
+THRESHOLDS = {
+    "first.wall_s": (0.25, 0.20),
+    "first.peak_mb": (0.20, 5.0),
+    "first.retained_blocks": (0.25, 20000),
+    "warm.median_ms": (0.30, 5.0),
+    "warm.p95_ms": (0.40, 10.0),
+    "warm.peak_mb": (0.20, 5.0),
+    "warm.retained_blocks": (0.50, 20000),
+}
+
+PAGES = [
+    "main.py",
+    "pages/00_MBTI진로.py",
+    "pages/01_MBTI책영화추천.py",
+    "pages/02_관광지.py",
+    "pages/03_MBTI분석.py",
+    "pages/04_지하철분석.py",
+    "pages/05_수행평가.py",
+]
+
+
+# -------------------------------
+# 시나리오: step(조작 함수) 를 부를 때마다 조작 → rerun 한 번
+# -------------------------------
+def scenario_main(at, step, quick):
+    step(lambda at: at.text_input[0].set_value("진우"))
+    step(lambda at: at.selectbox[0].select_index(1))
+    step(lambda at: at.button[0].click())
+
+
+def _every_option(at, step, index, quick):
+    """selectbox index 의 모든 값을 차례로 고른다 (MBTI 16유형 등)"""
+    options = at.selectbox[index].options
+    for value in options[:4] if quick else options:
+        step(lambda at, value=value: at.selectbox[index].set_value(value))
+
+
+def scenario_00(at, step, quick):
+    _every_option(at, step, 0, quick)
+
+
+def scenario_01(at, step, quick):
+    _every_option(at, step, 0, quick)
+
+
+def scenario_02(at, step, quick):
+    # 지도 페이지는 위젯이 없으므로 같은 화면 rerun (캐시된 지도 HTML 재사용)
+    for _ in range(3 if quick else 10):
+        step(lambda at: None)
+
+
+def scenario_03(at, step, quick):
+    step(lambda at: at.checkbox[0].check())
+    countries = at.selectbox[0].options
+    for country in countries[:3] if quick else countries[::10]:
+        step(lambda at, country=country: at.selectbox[0].set_value(country))
+    _every_option(at, step, 1, quick)  # MBTI 유형별 TOP 10
+    step(lambda at: at.radio[1].set_value(at.radio[1].options[1]))
+    step(lambda at: at.checkbox[1].check())
+
+
+def scenario_04(at, step, quick):
+    # 기본 보기: 모든 날짜 × 모든 호선 (quick 이면 일주일 간격)
+    date_input = at.date_input[0]
+    first, last = date_input.min, date_input.max
+    days = [first.fromordinal(d) for d in range(first.toordinal(), last.toordinal() + 1)]
+    lines = at.selectbox[0].options
+    for day in days[::7] if quick else days:
+        step(lambda at, day=day: at.date_input[0].set_value(day))
+        for line in lines[::7] if quick else lines:
+            step(lambda at, line=line: at.selectbox[0].set_value(line))
+
+    # 역별 추이·이상치, 전체 역·호선 보기
+    step(lambda at: at.radio[0].set_value("역별 추이·이상치"))
+    for station in at.selectbox[0].options[:3 if quick else 20]:
+        step(lambda at, station=station: at.selectbox[0].set_value(station))
+    step(lambda at: at.radio[0].set_value("전체 역·호선"))
+    step(lambda at: at.checkbox[0].uncheck())
+
+
+def scenario_05(at, step, quick):
+    # 전체 안내문자 파일·전체 기간 기준으로 구별/유형별/추이/검색을 돌아본다
+    step(lambda at: at.multiselect[0].set_value(at.multiselect[0].options[:3]))
+    step(lambda at: at.multiselect[0].set_value([]))
+    gus = at.selectbox[0].options
+    for gu in gus[:3] if quick else gus:
+        step(lambda at, gu=gu: at.selectbox[0].set_value(gu))
+    step(lambda at: at.radio[0].set_value("시간"))
+    for query in ["태풍", '"해안가 접근"', "코로나 확진자", "호우 주의"][:2 if quick else 4]:
+        step(lambda at, query=query: at.text_input[0].set_value(query))
+    step(lambda at: at.number_input[0].set_value(2))
+    step(lambda at: at.selectbox[1].set_value("해운대구"))
+
+
+SCENARIOS = {
+    "main.py": scenario_main,
+    "00": scenario_00,
+    "01": scenario_01,
+    "02": scenario_02,
+    "03": scenario_03,
+    "04": scenario_04,
+    "05": scenario_05,
+}
+
+
+def _scenario_for(page):
+    name = os.path.basename(page)
+    return SCENARIOS.get(name) or SCENARIOS[name[:2]]
+
+
+# -------------------------------
+# 자식 프로세스: 페이지 하나를 실행하고 JSON 한 줄을 출력
+# -------------------------------
+def child(page, trace, quick):
+    import time
+    import tracemalloc
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    from streamlit.testing.v1 import AppTest
+
+    def measure(fn):
+        if trace:
+            tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        result = {"seconds": elapsed, "retained_blocks": sys.getallocatedblocks() - blocks}
+        if trace:
+            result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        return result
+
+    if trace:
+        tracemalloc.start()
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=300)
+    first = measure(at.run)
+    if at.exception:
+        raise SystemExit(f"{page}: 첫 실행 예외 {[e.message for e in at.exception]}")
+
+    reruns = []
+
+    def step(action):
+        def rerun():
+            action(at)
+            at.run()
+        reruns.append(measure(rerun))
+        if at.exception:
+            raise SystemExit(f"{page}: rerun 예외 {[e.message for e in at.exception]}")
+
+    _scenario_for(page)(at, step, quick)
+    print(json.dumps({"first": first, "reruns": reruns}))
+
+
+def run_child(page, trace, quick):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONWARNINGS="ignore", APP_WARMUP="0")
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", page]
+    cmd += ["--trace"] if trace else []
+    cmd += ["--quick"] if quick else []
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"{page} 실패")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def measure_page(page, quick, repeat=3):
+    timings = [run_child(page, trace=False, quick=quick) for _ in range(repeat)]
+    memory = run_child(page, trace=True, quick=quick)
+    # 시간 지표는 반복 실행들의 중앙값
+    reruns_ms = [[r["seconds"] * 1000 for r in t["reruns"]] for t in timings]
+    return {
+        "first": {
+            "wall_s": round(statistics.median(t["first"]["seconds"] for t in timings), 3),
+            "peak_mb": round(memory["first"]["peak_mb"], 1),
+            "retained_blocks": int(statistics.median(t["first"]["retained_blocks"] for t in timings)),
+        },
+        "warm": {
+            "reruns": len(reruns_ms[0]),
+            "median_ms": round(statistics.median(_percentile(ms, 0.5) for ms in reruns_ms), 1),
+            "p95_ms": round(statistics.median(_percentile(ms, 0.95) for ms in reruns_ms), 1),
+            "peak_mb": round(max((r["peak_mb"] for r in memory["reruns"]), default=0.0), 1),
+            "retained_blocks": int(statistics.median(sum(r["retained_blocks"] for r in t["reruns"]) for t in timings)),
+        },
+    }
+
+
+# -------------------------------
+# 기준값 비교
+# -------------------------------
+def compare(results, baseline):
+    thresholds = {**THRESHOLDS, **{k: tuple(v) for k, v in baseline.get("thresholds", {}).items()}}
+    failures = []
+    for page, metrics in results.items():
+        base = baseline.get("pages", {}).get(page)
+        if base is None:
+            continue
+        for name, (ratio, floor) in thresholds.items():
+            group, metric = name.split(".")
+            old, new = base[group][metric], metrics[group][metric]
+            if new > old * (1 + ratio) and new > old + floor:
+                failures.append(f"{page} {name}: {old} → {new} (허용 +{ratio:.0%}, 최소폭 {floor})")
+    return failures
+
+
+def environment():
+    import pandas
+    import streamlit
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="측정할 페이지 파일 이름 일부 (없으면 전부)")
+    parser.add_argument("--quick", action="store_true", help="시나리오를 줄여서 빠르게")
+    parser.add_argument("--update", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.trace, args.quick)
+        return
+
+    pages = [p for p in PAGES if not args.pages or any(name in p for name in args.pages)]
+    results = {}
+    print(f"{'페이지':<28}{'첫 실행':>9}{'최대MB':>8}{'rerun':>7}{'중앙값':>9}{'p95':>9}{'최대MB':>8}")
+    for page in pages:
+        r = results[page] = measure_page(page, args.quick, args.repeat)
+        print(
+            f"{os.path.basename(page):<28}{r['first']['wall_s']:>8.2f}s{r['first']['peak_mb']:>8.1f}"
+            f"{r['warm']['reruns']:>7}{r['warm']['median_ms']:>7.1f}ms{r['warm']['p95_ms']:>7.1f}ms"
+            f"{r['warm']['peak_mb']:>8.1f}"
+        )
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update:
+        baseline.setdefault("thresholds", {k: list(v) for k, v in THRESHOLDS.items()})
+        baseline["environment"] = environment()
+        baseline["quick"] = args.quick
+        baseline.setdefault("pages", {}).update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+        return
+
+    if not baseline:
+        print("기준값 파일이 없습니다. --update 로 먼저 만드세요.")
+        return
+    if baseline.get("quick", False) != args.quick:
+        print("주의: 기준값과 시나리오 크기(--quick)가 다릅니다.")
+    failures = compare(results, baseline)
+    for failure in failures:
+        print("회귀:", failure)
+    if failures:
+        sys.exit(1)
+    print("기준값 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
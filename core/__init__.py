@@ -0,0 +1,7 @@
+import os
+
+# 저장소 루트 (pages/와 CSV 파일들이 있는 위치)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 파싱 결과·집계 결과를 저장하는 로컬 캐시 폴더
+CACHE_DIR = os.environ.get("APP_CACHE_DIR", os.path.join(ROOT_DIR, ".cache"))
@@ -0,0 +1,167 @@
+"""
+부산 재난 안내문자(gagagaga.CSV) 로드와 구/군 파싱
+
+- 파일은 판별해 둔 인코딩으로 읽고(core.sources), 범주형·날짜형으로 압축한다.
+- 대상지역 → 구/군 파싱은 행마다 반복하지 않는다.
+  대상지역은 서로 다른 값이 수십 개뿐이므로, 그 값들만 split·explode 해서
+  토큰 → 구/군 매핑 표를 만들고, 범주 코드로 조인해 (안내문자, 구) 긴 형식 표를 만든다.
+"""
+import numpy as np
+import pandas as pd
+
+from core import frames, sources
+
+BUSAN_GU_LIST = [
+    "중구", "서구", "동구", "영도구", "부산진구", "동래구", "남구", "북구", "해운대구",
+    "사하구", "금정구", "강서구", "연제구", "수영구", "사상구", "기장군"
+]
+
+
+def load_alerts(path):
+    """
+    안내문자 DataFrame 과 압축 전후 메모리 보고를 반환한다.
+    재난유형·대상지역은 범주형, 일자·전송시간은 한 번만 날짜로 파싱한다.
+    """
+    raw = sources.read_csv(path)
+    raw.columns = raw.columns.str.strip()  # "일자 " 처럼 뒤에 공백이 붙은 열 이름 정리
+
+    categories = [c for c in ["재난유형", "대상지역"] if c in raw.columns]
+    df, report = frames.compact(raw, categories=categories)
+    if "일자" in df.columns:
+        df["일자"] = pd.to_datetime(df["일자"], format="%Y-%m-%d")
+    if "전송시간" in df.columns:
+        df["전송시간"] = pd.to_datetime(df["전송시간"], format="%Y-%m-%d %H:%M", errors="coerce")
+    report["after_mb"] = frames.memory_mb(df)
+    return df, report
+
+
+def token_gu_table(regions):
+    """
+    대상지역 값(예: "부산광역시,중구,서구") 목록 → (지역 번호, 구) 매핑 표.
+    지역 번호는 regions 안에서의 위치(= 범주 코드)이다.
+    """
+    tokens = pd.Series(regions, dtype="str").str.split(",").explode()
+    clean = (
+        tokens.str.replace("부산광역시", "", regex=False)
+        .str.replace(r"[ 　]", "", regex=True)
+    )
+
+    gu = clean.where(clean.str.endswith(("구", "군")))
+    gu = gu.mask(clean == "기장", "기장군")
+
+    table = pd.DataFrame({"region_code": gu.index, "구": gu.to_numpy()}).dropna()
+    table = table[table["구"].isin(BUSAN_GU_LIST)].drop_duplicates()
+    return table.astype({"region_code": "int16", "구": pd.CategoricalDtype(BUSAN_GU_LIST)})
+
+
+def alert_gu_table(df):
+    """(alert, 구) 긴 형식 표. alert 는 df 의 행 위치이다."""
+    regions = df["대상지역"].astype("category")
+    mapping = token_gu_table(regions.cat.categories)
+
+    alerts = pd.DataFrame({
+        "alert": pd.RangeIndex(len(df), dtype="int32"),
+        "region_code": regions.cat.codes.to_numpy(),
+    })
+    long = alerts.merge(mapping, on="region_code", how="inner")
+    return long[["alert", "구"]].sort_values(["alert", "구"], ignore_index=True)
+
+
+def gu_counts(long):
+    """구별 안내문자 수 (BUSAN_GU_LIST 순서, 없는 구는 0)"""
+    return long["구"].value_counts(sort=False).reindex(BUSAN_GU_LIST, fill_value=0)
+
+
+def cube_cells(df, long, freq="D"):
+    """
+    (시간 구간, 구, 재난유형) 별 안내문자 수 표와 구간 범위.
+    반환값: (시각·구·재난유형·건수 열의 DataFrame, {"freq", "start", "end"})
+    구·재난유형은 범주형이며, 건수가 0 인 칸은 없다.
+    """
+    if freq == "h":
+        times = df["전송시간"].fillna(df["일자"]).dt.floor("h")
+    else:
+        times = df["일자"].dt.floor("D")
+    types = df["재난유형"].astype("category")
+
+    alert = long["alert"].to_numpy()
+    cells = (
+        pd.DataFrame({
+            "시각": times.to_numpy()[alert],
+            "구": long["구"].to_numpy(),
+            "재난유형": types.to_numpy()[alert],
+        })
+        .astype({"구": long["구"].dtype, "재난유형": types.dtype})
+        .groupby(["시각", "구", "재난유형"], observed=True)
+        .size()
+        .reset_index(name="건수")
+    )
+    meta = {"freq": freq, "start": times.min().isoformat(), "end": times.max().isoformat()}
+    return cells, meta
+
+
+class AlertCube:
+    """
+    (시간 구간 × 구 × 재난유형) 안내문자 수 집계 큐브
+
+    freq="D" 는 일 단위, freq="h" 는 시간 단위 구간이다.
+    값이 있는 칸만 (구간, 구, 유형, 개수) 배열로 구간 순 정렬해 저장하므로,
+    기간 조회는 searchsorted 로 연속 구간을 잘라 bincount 로 더하기만 한다.
+    원본 안내문자 행은 cube_cells 에서 한 번만 집계하고, 그 표는 파일로 저장해 둘 수 있다.
+    """
+
+    def __init__(self, cells, freq="D", start=None, end=None):
+        self.freq = freq
+        self.step = pd.Timedelta(1, unit=freq)
+        times = cells["시각"]
+        self.origin = pd.Timestamp(start) if start is not None else times.min()
+        end = pd.Timestamp(end) if end is not None else times.max()
+        self.buckets = pd.date_range(self.origin, end, freq=freq)
+
+        self.types = list(cells["재난유형"].cat.categories)
+        self.gus = list(BUSAN_GU_LIST)
+
+        order = np.argsort(times.to_numpy(), kind="stable")
+        self.bucket = ((times - self.origin) // self.step).to_numpy()[order].astype("int32")
+        self.gu = cells["구"].cat.codes.to_numpy()[order].astype("int8")
+        self.type = cells["재난유형"].cat.codes.to_numpy()[order].astype("int16")
+        self.count = cells["건수"].to_numpy()[order].astype("int32")
+
+    def _position(self, ts):
+        return (pd.Timestamp(ts) - self.origin) // self.step
+
+    def _select(self, start, stop, gu=None, types=None):
+        """[start, stop) 구간의 칸 위치 (연속 슬라이스 + 구/유형 조건)"""
+        lo = np.searchsorted(self.bucket, self._position(start), side="left")
+        hi = max(np.searchsorted(self.bucket, self._position(stop), side="left"), lo)
+        keep = slice(lo, hi)
+        mask = np.ones(hi - lo, dtype=bool)
+        if gu is not None:
+            mask &= self.gu[keep] == self.gus.index(gu)
+        if types:
+            codes = [self.types.index(t) for t in types]
+            mask &= np.isin(self.type[keep], codes)
+        return lo + np.flatnonzero(mask)
+
+    def by_gu(self, start, stop, types=None):
+        """기간·유형 조건에서 구별 안내문자 수"""
+        idx = self._select(start, stop, types=types)
+        counts = np.bincount(self.gu[idx], weights=self.count[idx], minlength=len(self.gus))
+        return pd.Series(counts.astype("int64"), index=self.gus)
+
+    def by_type(self, start, stop, gu=None):
+        """기간·구 조건에서 재난유형별 안내문자 수 (0 인 유형은 제외, 많은 순)"""
+        idx = self._select(start, stop, gu=gu)
+        counts = np.bincount(self.type[idx], weights=self.count[idx], minlength=len(self.types))
+        series = pd.Series(counts.astype("int64"), index=self.types)
+        return series[series > 0].sort_values(ascending=False)
+
+    def series(self, start, stop, gu=None, types=None):
+        """기간·구·유형 조건에서 시간 구간별 안내문자 수 (빈 구간은 0)"""
+        first = max(self._position(start), 0)
+        last = min(self._position(stop), len(self.buckets))
+        idx = self._select(start, stop, gu=gu, types=types)
+        counts = np.bincount(
+            self.bucket[idx] - first, weights=self.count[idx], minlength=max(last - first, 0)
+        )
+        return pd.Series(counts.astype("int64"), index=self.buckets[first:last])
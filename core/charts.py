@@ -0,0 +1,115 @@
+"""
+큰 Plotly 그래프용 도우미
+
+브라우저로 보내는 그래프 JSON 크기가 데이터 크기에 비례해 커지지 않도록 한다.
+- 점이 많은 선 그래프는 WebGL(Scattergl) trace 를 쓴다.
+- 긴 시계열은 서버에서 구간별 최솟값·최댓값만 남겨 점 수를 max_points 이하로 줄인다
+  (봉우리·골짜기 모양은 유지된다).
+- 막대 색 그라데이션은 NumPy 로 한 번에 만든다.
+- 막대가 많으면 막대 위 숫자(text)를 생략한다.
+- 단계구분도는 경계를 URL 로 넘겨 값 배열만 보낼 수 있다 (core.districts).
+"""
+from functools import reduce
+
+import numpy as np
+import plotly.graph_objects as go
+
+WEBGL_THRESHOLD = 1000   # 이 점 수를 넘으면 WebGL trace
+MAX_POINTS = 2000        # 시계열 하나에 보낼 최대 점 수
+MAX_BAR_LABELS = 30      # 이보다 막대가 많으면 숫자 표시 생략
+
+
+def gradient_colors(n, start=(0, 0, 255), end=(200, 220, 255), first="red"):
+    """
+    n개의 막대 색. 첫 번째는 first, 나머지는 start → end 로 흐려지는 그라데이션.
+    rgb 문자열 배열을 NumPy 문자열 연산으로 한 번에 만든다.
+    """
+    if n <= 0:
+        return np.array([], dtype=str)
+    steps = np.linspace(0, 1, max(n - 1, 0))[:, None]
+    rgb = (np.asarray(start) + (np.asarray(end) - np.asarray(start)) * steps).astype(int).astype(str)
+    colors = reduce(np.char.add, ["rgb(", rgb[:, 0], ", ", rgb[:, 1], ", ", rgb[:, 2], ")"])
+    return np.concatenate([[first], colors]) if first is not None else colors
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """
+    구간별 최솟값·최댓값 솎아내기. 점이 max_points 보다 많으면
+    max_points/2 개 구간으로 나누어 각 구간의 최소·최대 점만 (원래 순서대로) 남긴다.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    buckets = max_points // 2
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    block = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+
+    # NaN 은 최소·최대 후보에서 빼고, NaN 만 있는 구간은 첫 점을 쓴다
+    lo = offsets + np.where(np.isnan(block), np.inf, block).argmin(axis=1)
+    hi = offsets + np.where(np.isnan(block), -np.inf, block).argmax(axis=1)
+
+    keep = np.unique(np.concatenate([lo, hi]))
+    keep = keep[keep < n]
+    return x[keep], y[keep]
+
+
+def line_trace(x, y, name=None, max_points=MAX_POINTS, **kwargs):
+    """점 수에 따라 Scatter / Scattergl 을 고르고, 길면 솎아낸 선 trace"""
+    x, y = downsample(x, y, max_points)
+    trace = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, name=name, mode=kwargs.pop("mode", "lines"), **kwargs)
+
+
+def multi_line_trace(series, max_points_each=200, name=None, **kwargs):
+    """
+    여러 시계열을 NaN 구분자로 이어 붙인 trace 하나 (trace 수백 개 대신).
+    series: {이름: (x, y)}. 마우스를 올리면 이름이 보인다.
+    """
+    xs, ys, labels = [], [], []
+    for label, (x, y) in series.items():
+        x, y = downsample(x, y, max_points_each)
+        xs += [x, [x[-1]] if len(x) else []]
+        ys += [y, [np.nan]]
+        labels += [np.full(len(y) + 1, label, dtype=object)]
+    x = np.concatenate(xs) if xs else np.array([])
+    y = np.concatenate(ys) if ys else np.array([])
+    text = np.concatenate(labels) if labels else np.array([])
+    trace = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, text=text, name=name, mode="lines",
+                 hovertemplate="%{text}<br>%{x}<br>%{y:,.0f}<extra></extra>",
+                 connectgaps=False, **kwargs)
+
+
+def bar_trace(x, y, colors=None, **kwargs):
+    """막대가 많으면 숫자 표시를 생략한 막대 trace"""
+    y = np.asarray(y)
+    if len(y) <= MAX_BAR_LABELS:
+        kwargs.setdefault("text", y)
+        kwargs.setdefault("textposition", "outside")
+    return go.Bar(x=np.asarray(x), y=y, marker=dict(color=colors), **kwargs)
+
+
+def choropleth(geojson, locations, values, names, label, colorscale="YlOrRd", value_format=",.0f"):
+    """
+    단계구분도. geojson 은 FeatureCollection 또는 그 파일의 URL 이고, Feature 의 id 가 locations 값이다.
+    values·names 는 locations 와 같은 순서. uirevision 을 고정해 값만 바뀔 때 확대·이동 상태를 유지한다.
+    """
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson,
+        locations=np.asarray(locations),
+        z=np.asarray(values),
+        text=np.asarray(names, dtype=object),
+        colorscale=colorscale,
+        marker=dict(line=dict(color="white", width=1)),
+        colorbar=dict(title=label),
+        hovertemplate=f"%{{text}}<br>{label} %{{z:{value_format}}}<extra></extra>",
+    ))
+    fig.update_geos(fitbounds="locations", visible=False, projection_type="mercator")
+    fig.update_layout(height=520, margin=dict(l=0, r=0, t=30, b=0), uirevision="choropleth")
+    return fig
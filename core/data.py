@@ -0,0 +1,217 @@
+"""
+모든 페이지가 함께 쓰는 데이터 접근 계층
+
+페이지는 파일 경로·인코딩·파싱을 직접 다루지 않고 아래 함수만 부른다.
+
+원본 데이터 (압축한 열 형식)
+- ``mbti()``      국가별 MBTI 16유형 비율 (SharedDataset, Country 순 정렬)
+- ``ridership()`` 지하철 승·하차 (SharedDataset, 사용일자 순 정렬), 메모리 보고
+- ``alerts()``    부산 재난 안내문자 (SharedDataset), 메모리 보고
+- ``stations()``  지하철역 좌표 (DataFrame)
+- ``pois()``      추가 관광지 목록 pois.csv (DataFrame, 파일이 없으면 None)
+- ``districts()`` 부산 구/군 경계 busan_gu.geojson 을 단순화한 FeatureCollection (파일이 없으면 None)
+
+페이지에서 쓰는 집계
+- ``mbti_ranks()``      국가 × 유형 순위 표
+- ``station_totals()``  (날짜, 호선, 역) 별 승·하차 합계
+- ``alert_gu()``        (안내문자, 구) 긴 형식 표
+- ``alert_cube(freq)``  (시간 구간, 구, 재난유형) 별 안내문자 수 큐브
+
+부를 때마다 파일 상태만 확인하고(os.stat), 결과는 내용 해시를 키로 프로세스에 하나씩 둔다.
+새 데이터 파일을 넣으면 다음 rerun 에서 바로 반영되고(재시작 불필요),
+그대로인 파일은 다시 파싱하지 않는다. 각 결과의 ``key`` 는 페이지에서 파생 캐시의 키로 쓴다.
+
+SharedDataset 결과는 캐시 폴더에 버전 붙은 Arrow 파일로도 저장되므로(core.datasets),
+새로 뜬 워커 프로세스는 CSV 를 파싱·집계하지 않고 파일을 메모리 맵으로 연다.
+배포 전에 아래처럼 미리 만들어 둘 수 있다 (원본이 바뀌었거나 파일이 없으면 그때 다시 계산)::
+
+    python -m core.data
+"""
+import os
+import sys
+import threading
+import time
+
+from core import alerts as alert_parser
+from core import datasets, districts as district_geo, frames, perf, ridership as ridership_series, sources, subway_ingest
+from core.mbti import MBTIRanks
+
+MBTI_CSV = "countriesMBTI_16types.csv"
+ALERTS_CSV = "gagagaga.CSV"
+STATIONS_CSV = "stations.csv"
+POIS_CSV = "pois.csv"
+DISTRICTS_GEOJSON = "busan_gu.geojson"
+
+# 이름 → (키, 결과). 이름마다 최신 결과 하나만 둔다.
+_loaded = {}
+# 이름마다 잠금을 따로 두어, 한 데이터셋을 파싱하는 동안 다른 데이터셋은 기다리지 않게 한다
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(name):
+    with _locks_guard:
+        return _locks.setdefault(name, threading.Lock())
+
+
+def _cached(name, key, build):
+    with _lock_for(name):
+        entry = _loaded.get(name)
+        hit = entry is not None and entry[0] == key
+        perf.cache_event("data", name, hit)
+        if hit:
+            return entry[1]
+        value = build()
+        _loaded[name] = (key, value)
+        return value
+
+
+def _csv_key(filename):
+    return (filename, sources.content_hash(sources.path(filename)))
+
+
+def mbti():
+    """국가별 MBTI 비율 (Country 열 + 16유형 열)"""
+    key = _csv_key(MBTI_CSV)
+    return _cached("mbti", key, lambda: datasets.cached(
+        "mbti", key, lambda: (sources.read_csv(sources.path(MBTI_CSV)), None), sort_by="Country"
+    ))
+
+
+def ridership():
+    """
+    지하철 승·하차 (사용일자, 노선명, 역명, 승차총승객수, 하차총승객수)와 압축 전후 메모리 보고.
+    원본 폴더의 subway*.csv 중 바뀐 파일만 Parquet 파티션으로 다시 변환한다.
+    노선명·역명은 범주형, 인원 수는 int32 이다.
+    """
+    # 파티션 변환은 한 번에 하나만 (동시에 열린 세션들이 같은 파일을 쓰지 않도록)
+    with _lock_for("subway-ingest"):
+        key = subway_ingest.ingest()
+
+    def build():
+        return frames.compact(
+            subway_ingest.load_partitions(),
+            categories=["노선명", "역명"],
+            int32=["승차총승객수", "하차총승객수"],
+        )
+
+    dataset = _cached("subway", key, lambda: datasets.cached("subway", key, build, sort_by="사용일자"))
+    return dataset, dataset.meta
+
+
+def alerts():
+    """부산 재난 안내문자와 압축 전후 메모리 보고. 재난유형·대상지역은 범주형, 일자·전송시간은 날짜형."""
+    key = _csv_key(ALERTS_CSV)
+    dataset = _cached("alerts", key, lambda: datasets.cached(
+        "alerts", key, lambda: alert_parser.load_alerts(sources.path(ALERTS_CSV))
+    ))
+    return dataset, dataset.meta
+
+
+def stations():
+    """지하철역 좌표 (역명, 노선, 위도, 경도). 역명은 승·하차 데이터의 역명과 같다."""
+    key = _csv_key(STATIONS_CSV)
+    df = _cached("stations", key, lambda: sources.read_csv(sources.path(STATIONS_CSV)))
+    return df, key
+
+
+def pois():
+    """추가 관광지 (이름, 위도, 경도, 설명)와 키. pois.csv 가 없으면 (None, None)."""
+    if not os.path.exists(sources.path(POIS_CSV)):
+        return None, None
+    key = _csv_key(POIS_CSV)
+    df = _cached("pois", key, lambda: sources.read_csv(
+        sources.path(POIS_CSV), usecols=["이름", "위도", "경도", "설명"]
+    ))
+    return df, key
+
+
+def districts():
+    """
+    부산 구/군 경계 (단순화한 FeatureCollection, Feature id = BUSAN_GU_LIST 위치)와 키.
+    busan_gu.geojson 이 없으면 (None, None).
+    """
+    path = sources.path(DISTRICTS_GEOJSON)
+    if not os.path.exists(path):
+        return None, None
+    key = (DISTRICTS_GEOJSON, sources.content_hash(path), district_geo.TOLERANCE)
+    geo = _cached("districts", key, lambda: district_geo.cached(path, key))
+    return geo, key
+
+
+# -------------------------------
+# 집계 (원본 키를 그대로 키로 쓴다)
+# -------------------------------
+def mbti_ranks():
+    """국가 × 유형 순위 표 (Country 열 + 유형별 순위, 1 = 비율이 가장 높은 국가)"""
+    source = mbti()
+
+    def build():
+        ranks = MBTIRanks(source.df)
+        return ranks.rank_frame().rename_axis("Country").reset_index(), None
+
+    return _cached("mbti_ranks", source.key, lambda: datasets.cached("mbti_ranks", source.key, build))
+
+
+def ranks(top_n=10):
+    """순위 표를 미리 계산된 순위로 채운 MBTIRanks"""
+    table = mbti_ranks().df
+    return MBTIRanks(mbti().df, top_n=top_n, rank=table.drop(columns="Country").to_numpy())
+
+
+def station_totals():
+    """(사용일자, 노선명, 역명) 별 승차·하차·승하차합계 — 날짜·호선 순, 같은 날짜·호선 안에서는 많은 역부터"""
+    source, _ = ridership()
+    return _cached("subway_totals", source.key, lambda: datasets.cached(
+        "subway_totals", source.key,
+        lambda: (ridership_series.station_totals(source.df), None),
+        sort_by="사용일자",
+    ))
+
+
+def alert_gu():
+    """(alert, 구) 긴 형식 표. alert 는 alerts() 표의 행 위치이다."""
+    source, _ = alerts()
+    return _cached("alert_gu", source.key, lambda: datasets.cached(
+        "alert_gu", source.key, lambda: (alert_parser.alert_gu_table(source.df), None)
+    ))
+
+
+def alert_cube(freq="D"):
+    """(시간 구간, 구, 재난유형) 별 안내문자 수 큐브. freq="D" 일 단위, "h" 시간 단위."""
+    source, _ = alerts()
+    name = f"alert_cells_{freq}"
+
+    def build():
+        cells = datasets.cached(
+            name, source.key, lambda: alert_parser.cube_cells(source.df, alert_gu().df, freq)
+        )
+        return alert_parser.AlertCube(cells.df, **cells.meta)
+
+    return _cached(name, source.key, build)
+
+
+ARTIFACTS = [
+    ("mbti", mbti),
+    ("mbti_ranks", mbti_ranks),
+    ("subway", ridership),
+    ("subway_totals", station_totals),
+    ("alerts", alerts),
+    ("alert_gu", alert_gu),
+    ("alert_cells_D", lambda: alert_cube("D")),
+    ("alert_cells_h", lambda: alert_cube("h")),
+    ("districts", districts),
+]
+
+
+def build_all(out=sys.stdout):
+    """모든 데이터·집계 파일을 미리 만든다 (이미 최신이면 열어 보기만 한다)"""
+    for name, build in ARTIFACTS:
+        start = time.perf_counter()
+        build()
+        print(f"{name:<15} {time.perf_counter() - start:6.2f}s", file=out)
+    print(f"→ {datasets.ARROW_DIR}", file=out)
+
+
+if __name__ == "__main__":
+    build_all()
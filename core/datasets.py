@@ -0,0 +1,121 @@
+"""
+워커 안의 모든 세션이 함께 쓰는 읽기 전용 데이터셋 핸들
+
+``@st.cache_data`` 는 캐시된 DataFrame 을 pickle 해 두었다가 rerun 마다 새 사본으로 풀어 준다.
+여기서는 DataFrame 을 Arrow IPC 파일로 한 번 써 두고 메모리 맵으로 열어,
+``@st.cache_resource`` 로 감싼 하나의 핸들을 모든 세션이 그대로 공유한다.
+
+- 숫자·날짜 열은 메모리 맵 버퍼를 복사 없이 가리킨다. ``.df`` 는 매번 얕은 사본을 돌려주므로
+  (pandas copy-on-write) 호출한 쪽이 값을 바꿔도 그 사본만 복사되고, 다른 세션이 보는 프레임은 그대로다.
+- 같은 파일을 여는 다른 워커 프로세스도 OS 페이지 캐시를 통해 같은 메모리를 쓴다.
+- ``sort_by`` 열로 정렬해 저장해 두면 ``keys()`` 가 그 열의 값 목록을 정렬 순서로 돌려준다.
+- 파일 이름은 (FORMAT_VERSION, key) 의 해시이므로, 원본이 그대로이고 형식이 같으면
+  새로 뜬 워커 프로세스도 원본을 파싱하지 않고 저장된 파일을 바로 연다 (``cached``).
+"""
+import glob
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+
+from core import CACHE_DIR, perf
+
+ARROW_DIR = os.path.join(CACHE_DIR, "arrow")
+
+# 저장 형식이나 집계 방식이 바뀌면 올려서 예전 파일을 쓰지 않게 한다
+FORMAT_VERSION = 1
+
+
+class SharedDataset:
+    """메모리 맵 Arrow 테이블과, 그 버퍼를 가리키는 공유 DataFrame"""
+
+    def __init__(self, name, table, sort_by=None, key=None):
+        self.name = name
+        self.key = key
+        self.meta = json.loads((table.schema.metadata or {}).get(b"meta", b"{}"))
+        self.table = table
+        self._df = table.to_pandas(split_blocks=True, date_as_object=False)
+        self.sort_by = sort_by
+        self._keys = []
+
+        if sort_by is not None:
+            # 정렬된 열에서 값이 바뀌는 지점의 값들
+            keys = self._df[sort_by]
+            self._keys = keys[keys.ne(keys.shift())].tolist()
+
+    def keys(self):
+        """sort_by 열의 값 목록 (정렬 순서)"""
+        return list(self._keys)
+
+    @property
+    def df(self):
+        """
+        공유 프레임의 얕은 사본. 데이터는 복사하지 않고, 값을 바꾸면 바꾼 쪽만 복사된다
+        (공유 프레임을 그대로 내주면 한 세션의 수정이 모든 세션에 보인다).
+        """
+        return self._df.copy(deep=False)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+
+def _arrow_path(name, key):
+    digest = hashlib.sha1(repr((FORMAT_VERSION, key)).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(ARROW_DIR, f"{name}-{digest}.arrow")
+
+
+def _open(name, path, key, sort_by):
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    return SharedDataset(name, table, sort_by=sort_by, key=key)
+
+
+def publish(name, df, key, sort_by=None, meta=None):
+    """
+    df 를 Arrow IPC 파일로 저장(같은 key 의 파일이 이미 있으면 재사용)하고
+    메모리 맵으로 열어 SharedDataset 을 반환한다.
+    meta(JSON 으로 저장 가능한 dict)는 파일에 함께 저장되어 ``.meta`` 로 읽을 수 있다.
+    """
+    path = _arrow_path(name, key)
+
+    if not os.path.exists(path):
+        os.makedirs(ARROW_DIR, exist_ok=True)
+        if sort_by is not None:
+            df = df.sort_values(sort_by, kind="stable")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if meta is not None:
+            metadata = dict(table.schema.metadata or {})
+            metadata[b"meta"] = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+
+        # 같은 이름의 예전 버전 파일 정리 (이미 열어 둔 프로세스는 계속 읽을 수 있음)
+        for old in glob.glob(os.path.join(ARROW_DIR, f"{name}-*.arrow")):
+            if old != path:
+                try:
+                    os.remove(old)
+                except FileNotFoundError:  # 다른 워커가 먼저 지움
+                    pass
+
+    return _open(name, path, key, sort_by)
+
+
+def cached(name, key, build, sort_by=None):
+    """
+    key 로 저장된 파일이 있으면 build 없이 바로 열고,
+    없거나 예전 것이면 build() 가 돌려준 (DataFrame, meta) 를 저장해서 연다.
+    """
+    path = _arrow_path(name, key)
+    exists = os.path.exists(path)
+    perf.cache_event("arrow", name, exists)
+    if exists:
+        return _open(name, path, key, sort_by)
+    df, meta = build()
+    return publish(name, df, key, sort_by=sort_by, meta=meta)
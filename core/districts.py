@@ -0,0 +1,208 @@
+"""
+부산 구/군 경계 (단계구분도용)
+
+원본 행정경계 GeoJSON 은 수 MB 라 rerun 마다 브라우저로 보낼 수 없다.
+- 경계 파일을 한 번 읽어 구/군별로 모으고, Douglas-Peucker 로 단순화한 뒤 좌표를 반올림해
+  작은 FeatureCollection 으로 캐시 폴더에 저장한다 (원본 내용 해시가 키, core.datasets 와 같은 방식).
+- 각 Feature 의 id 는 alerts.BUSAN_GU_LIST 안의 위치이다. 큐브의 구별 집계(by_gu)가 같은 순서이므로
+  구 이름 문자열을 맞춰 보지 않고 배열 위치로 바로 색을 칠한다.
+- Streamlit 정적 파일 제공(server.enableStaticServing)이 켜져 있으면 단순화한 경계를 static/geo 에
+  한 번 써 두고 그래프에는 URL 만 넣는다. 브라우저가 경계를 한 번 받아 두고,
+  필터를 바꿀 때마다 오가는 것은 값 배열뿐이다 (그래프는 core.charts.choropleth).
+
+경계 파일은 구/군(시군구) 단위든 읍면동 단위든 된다 (같은 구의 도형은 하나로 모은다).
+전국 파일이면 시군구 코드(26··· / 예전 코드 21···)나 "부산광역시" 가 들어간 속성으로 부산만 고른다.
+"""
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from core import CACHE_DIR, ROOT_DIR, perf
+from core.alerts import BUSAN_GU_LIST
+
+GEO_DIR = os.path.join(CACHE_DIR, "geo")
+STATIC_DIR = os.path.join(ROOT_DIR, "static", "geo")
+STATIC_URL = "app/static/geo"
+
+# 저장 형식이나 단순화 방식이 바뀌면 올린다
+FORMAT_VERSION = 1
+TOLERANCE = 0.0005   # 단순화 허용 오차(도). 부산 위도에서 약 50m
+DECIMALS = 5         # 좌표 소수 자릿수 (약 1m)
+
+# 구 이름·행정코드가 들어 있을 수 있는 속성 이름 (앞에서부터 본다)
+NAME_KEYS = ("SIG_KOR_NM", "sggnm", "SGG_NM", "name", "NAME", "adm_nm", "ADM_NM", "구")
+CODE_KEYS = ("SIG_CD", "sgg", "code", "adm_cd", "ADM_CD", "adm_cd2")
+BUSAN_CODES = ("26", "21")
+
+
+# -------------------------------
+# 단순화
+# -------------------------------
+def simplify_ring(points, tolerance=TOLERANCE):
+    """
+    Douglas-Peucker. points 는 (n, 2) 배열(닫힌 고리면 처음 = 끝).
+    구간마다 남은 점들의 거리를 NumPy 로 한 번에 구하고, 가장 먼 점이 허용 오차보다 멀면 나눈다.
+    """
+    n = len(points)
+    if n <= 4:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        inner = points[i + 1:j]
+        a, b = points[i], points[j]
+        dx, dy = b - a
+        norm = np.hypot(dx, dy)
+        if norm == 0:  # 닫힌 고리의 처음·끝
+            dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            dist = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / norm
+        k = int(dist.argmax())
+        if dist[k] > tolerance:
+            mid = i + 1 + k
+            keep[mid] = True
+            stack += [(i, mid), (mid, j)]
+    return points[keep]
+
+
+def _simplify_polygon(rings, tolerance):
+    """[외곽, 구멍...] → 단순화한 고리들. 외곽이 점 4개 미만으로 줄어들면(작은 섬 등) None."""
+    out = []
+    for r, ring in enumerate(rings):
+        points = np.round(simplify_ring(np.asarray(ring, dtype=float)[:, :2], tolerance), DECIMALS)
+        if len(points) < 4:
+            if r == 0:
+                return None
+            continue
+        out.append(points.tolist())
+    return out
+
+
+def _polygons(geometry):
+    if geometry is None:
+        return []
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    if geometry["type"] == "GeometryCollection":
+        return [p for g in geometry["geometries"] for p in _polygons(g)]
+    return []
+
+
+# -------------------------------
+# 구/군 찾기
+# -------------------------------
+def _gu_of(properties):
+    """Feature 속성 → BUSAN_GU_LIST 안의 위치 (없으면 None)"""
+    for key in NAME_KEYS:
+        value = properties.get(key)
+        if value is None:
+            continue
+        for token in str(value).replace("부산광역시", " ").split():
+            if token in BUSAN_GU_LIST:
+                return BUSAN_GU_LIST.index(token)
+    return None
+
+
+def _is_busan(properties):
+    code = next((str(properties[k]) for k in CODE_KEYS if properties.get(k) is not None), "")
+    return code.startswith(BUSAN_CODES) or any("부산광역시" in str(v) for v in properties.values())
+
+
+def simplify_file(path, tolerance=TOLERANCE):
+    """경계 GeoJSON → 구/군별 MultiPolygon 16개 이하의 FeatureCollection (id = BUSAN_GU_LIST 위치)"""
+    with open(path, encoding="utf-8") as f:
+        source = json.load(f)
+    features = [
+        (feature.get("properties") or {}, feature.get("geometry"))
+        for feature in source.get("features", [])
+    ]
+    # 전국 파일이면 "중구"·"서구" 등이 여러 도시에 있으므로 부산 것만 남긴다
+    if any(_is_busan(props) for props, _ in features):
+        features = [(props, geom) for props, geom in features if _is_busan(props)]
+
+    polygons = {}
+    for props, geometry in features:
+        gu = _gu_of(props)
+        if gu is not None:
+            polygons.setdefault(gu, []).extend(_polygons(geometry))
+
+    out = []
+    for gu, rings_list in sorted(polygons.items()):
+        simplified = [p for p in (_simplify_polygon(rings, tolerance) for rings in rings_list) if p]
+        if not simplified:
+            # 너무 작아서 전부 사라지면 가장 큰 도형 하나는 반올림만 해서 남긴다
+            largest = max(rings_list, key=lambda rings: len(rings[0]))
+            simplified = [[np.round(np.asarray(largest[0], dtype=float)[:, :2], DECIMALS).tolist()]]
+        out.append({
+            "type": "Feature",
+            "id": gu,
+            "properties": {"name": BUSAN_GU_LIST[gu]},
+            "geometry": {"type": "MultiPolygon", "coordinates": simplified},
+        })
+    return {"type": "FeatureCollection", "features": out}
+
+
+# -------------------------------
+# 캐시와 정적 파일
+# -------------------------------
+def _digest(key):
+    return hashlib.sha1(repr((FORMAT_VERSION, key)).encode("utf-8")).hexdigest()[:12]
+
+
+def _write(path, geo):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(geo, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    # 예전 버전 정리
+    for old in glob.glob(os.path.join(os.path.dirname(path), "districts-*.json")):
+        if old != path:
+            try:
+                os.remove(old)
+            except FileNotFoundError:  # 다른 워커가 먼저 지움
+                pass
+
+
+def cached(path, key):
+    """key 로 저장된 단순화 경계가 있으면 읽고, 없으면 path 를 단순화해 저장한다"""
+    out = os.path.join(GEO_DIR, f"districts-{_digest(key)}.json")
+    exists = os.path.exists(out)
+    perf.cache_event("geo", "districts", exists)
+    if exists:
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+    geo = simplify_file(path)
+    _write(out, geo)
+    return geo
+
+
+def static_url(geo, key):
+    """
+    단순화 경계를 static/geo 에 (없을 때만) 쓰고 브라우저에서 받을 상대 URL 을 돌려준다.
+    파일 이름에 키 해시가 들어 있으므로 내용이 바뀌면 URL 도 바뀐다.
+    static 폴더에 쓸 수 없으면(읽기 전용 배포 등) None — 호출한 쪽은 경계를 그래프에 직접 넣는다.
+    """
+    name = f"districts-{_digest(key)}.json"
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        try:
+            _write(path, geo)
+        except OSError:
+            return None
+    return f"{STATIC_URL}/{name}"
+
+
+def ids(geo):
+    """경계 파일에 있는 구/군의 BUSAN_GU_LIST 위치 (정렬된 정수 배열)"""
+    return np.array([feature["id"] for feature in geo["features"]], dtype=int)
+
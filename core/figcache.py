@@ -0,0 +1,112 @@
+"""
+렌더링된 그래프 캐시 (rerun·세션 간 공유)
+
+같은 입력으로 그린 그래프를 다시 그리지 않도록, 워커 프로세스 하나에 LRU 캐시 하나를 둔다.
+- Matplotlib 그래프는 PNG 바이트로 저장하고, 그린 뒤 바로 plt.close 로 닫는다.
+- Plotly 그래프는 직렬화한 JSON 문자열로 저장한다.
+- 전체 크기가 상한(FIGURE_CACHE_MB, 기본 64MB)을 넘으면 가장 오래 안 쓴 항목부터 버린다.
+
+키는 (페이지, 그래프 종류, 데이터 키, 입력값...) 처럼 그래프를 결정하는 값을 모두 담은 튜플이다.
+데이터 파일이 바뀌면 데이터 키가 달라지므로 예전 그래프는 자연스럽게 밀려난다.
+"""
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from core import perf
+
+MAX_BYTES = int(float(os.environ.get("FIGURE_CACHE_MB", "64")) * 1024 ** 2)
+
+
+class FigureCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+_cache = FigureCache()
+
+
+def cache():
+    """워커 프로세스에서 공유하는 그래프 캐시"""
+    return _cache
+
+
+def _lookup(key):
+    """캐시 조회 + 계측 (항목 이름은 키의 앞 두 값, 예: "mbti/country")"""
+    data = _cache.get(key)
+    perf.cache_event("figure", "/".join(str(part) for part in key[:2]), data is not None)
+    return data
+
+
+def png(key, build, dpi=100):
+    """
+    key 로 캐시된 PNG 바이트를 반환한다.
+    없으면 build() 가 돌려준 Matplotlib Figure 를 PNG 로 저장하고 닫은 뒤 캐시한다.
+    """
+    data = _lookup(key)
+    if data is not None:
+        return data
+
+    with perf.phase("figure"):
+        # pyplot 은 실제로 그릴 때만 import (Plotly 만 쓰는 페이지는 matplotlib 을 불러오지 않는다)
+        import matplotlib.pyplot as plt
+
+        fig = build()
+        try:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        finally:
+            plt.close(fig)
+    return _cache.put(key, buffer.getvalue())
+
+
+def plotly(key, build):
+    """
+    key 로 캐시된 Plotly 그래프(dict)를 반환한다.
+    없으면 build() 가 돌려준 Figure 를 JSON 으로 직렬화해 캐시한다.
+    """
+    data = _lookup(key)
+    if data is None:
+        with perf.phase("figure"):
+            data = _cache.put(key, build().to_json())
+    return json.loads(data)
@@ -0,0 +1,31 @@
+"""
+DataFrame 메모리 압축 도우미
+
+Streamlit 워커마다 데이터프레임 사본을 들고 있으므로,
+반복되는 문자열은 범주형(category), 인원 수는 int32 로 줄여 프로세스 메모리를 아낀다.
+"""
+
+
+def memory_mb(df):
+    """deep=True 기준 DataFrame 메모리 사용량 (MB)"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compact(df, categories=(), int32=()):
+    """
+    지정한 열을 범주형 / int32 로 바꾼 DataFrame 과
+    압축 전후 메모리 사용량 {"before_mb", "after_mb"} 을 함께 반환한다.
+    """
+    before = memory_mb(df)
+    df = df.astype({
+        **{c: "category" for c in categories},
+        **{c: "int32" for c in int32},
+    })
+    return df, {"before_mb": before, "after_mb": memory_mb(df)}
+
+
+def format_report(report):
+    """압축 전후 메모리를 화면 표시용 문자열로 (읽을 때부터 압축된 형식이면 크기만)"""
+    if report["before_mb"] == report["after_mb"]:
+        return f"메모리 {report['after_mb']:.1f}MB"
+    return f"메모리 {report['before_mb']:.1f}MB → {report['after_mb']:.1f}MB"
@@ -0,0 +1,145 @@
+"""
+국가별 MBTI 16유형 비율 분석용 사전 계산
+
+로드할 때 한 번의 벡터 연산으로 아래를 모두 만들어 두고, 탭에서는 배열을 읽기만 한다.
+- 국가 × 유형 순위 행렬 (1 = 해당 유형 비율이 가장 높은 국가)
+- 유형별 상위 N개 국가
+- 국가별 유형 정렬 순서 (비율 높은 순)
+"""
+import numpy as np
+import pandas as pd
+
+KOREA_NAMES = ["korea", "south korea"]
+
+
+def type_colors(n):
+    """국가별 그래프 막대 색: 1위 빨강, 나머지는 순위가 낮을수록 옅은 파랑"""
+    i = np.arange(n)
+    blue = 0.1 + 0.9 * (1 - i / n)
+    colors = np.column_stack([np.zeros(n), np.full(n, 0.3), blue])
+    colors = [tuple(c) for c in colors]
+    colors[0] = "red"
+    return colors
+
+
+class MBTIRanks:
+    def __init__(self, df, top_n=10, rank=None):
+        """rank: 미리 계산해 둔 국가 × 유형 순위 행렬 (없으면 여기서 계산)"""
+        self.types = [c for c in df.columns if c != "Country"]
+        self.countries = df["Country"].to_numpy()
+        self.values = df[self.types].to_numpy(dtype=float)
+        self.top_n = top_n
+        self._country_pos = {c: i for i, c in enumerate(self.countries)}
+        self._type_pos = {t: j for j, t in enumerate(self.types)}
+
+        n_countries, n_types = self.values.shape
+
+        if rank is None:
+            # 유형(열)마다 국가를 비율 높은 순으로 정렬한 행 번호
+            self.country_order = np.argsort(-self.values, axis=0, kind="stable")
+
+            # 순위 행렬: rank[국가, 유형] (1부터)
+            self.rank = np.empty((n_countries, n_types), dtype=np.int32)
+            self.rank[self.country_order, np.arange(n_types)] = np.arange(1, n_countries + 1)[:, None]
+        else:
+            # 순위는 열마다 1..국가 수 의 순열이므로 역순열이 곧 정렬 순서
+            self.rank = np.asarray(rank, dtype=np.int32)
+            self.country_order = np.empty_like(self.rank)
+            self.country_order[self.rank - 1, np.arange(n_types)] = np.arange(n_countries)[:, None]
+        self.top = self.country_order[:top_n]
+
+        # 국가(행)마다 유형을 비율 높은 순으로 정렬한 열 번호
+        self.type_order = np.argsort(-self.values, axis=1, kind="stable")
+
+        self.is_korea = np.isin(np.char.lower(self.countries.astype(str)), KOREA_NAMES)
+        self.type_colors = type_colors(n_types)
+
+    def rank_frame(self):
+        """국가 × 유형 순위 표"""
+        return pd.DataFrame(self.rank, index=self.countries, columns=self.types)
+
+    def country_profile(self, country):
+        """국가의 (유형 목록, 비율) — 비율 높은 순"""
+        i = self._country_pos[country]
+        order = self.type_order[i]
+        return [self.types[j] for j in order], self.values[i, order]
+
+    def top_countries(self, mbti_type):
+        """유형의 상위 N개 (국가 목록, 비율, 한국 여부)"""
+        j = self._type_pos[mbti_type]
+        rows = self.top[:, j]
+        return self.countries[rows], self.values[rows, j], self.is_korea[rows]
+
+
+class MBTISimilarity:
+    """
+    국가 MBTI 프로필 간 유사도 검색 (코사인 / L1)
+
+    정규화 행렬을 미리 만들어 두고, 질의 하나는 한 번의 행렬 연산으로 모든 국가와 비교한다.
+    전체 유사도 행렬은 처음 요청할 때 행 블록 단위로 계산해 캐시한다
+    (국가 수가 수천 개로 늘어나도 L1 계산이 한꺼번에 N×N×16 메모리를 쓰지 않도록).
+    """
+
+    BLOCK_ROWS = 64
+
+    def __init__(self, df):
+        self.types = [c for c in df.columns if c != "Country"]
+        self.countries = df["Country"].to_numpy()
+        self.values = df[self.types].to_numpy(dtype=float)
+        self._country_pos = {c: i for i, c in enumerate(self.countries)}
+
+        norms = np.linalg.norm(self.values, axis=1, keepdims=True)
+        self.unit = self.values / np.where(norms == 0, 1, norms)
+        self._pairwise = {}
+        self._order = None
+
+    def vector(self, country):
+        return self.values[self._country_pos[country]]
+
+    def scores(self, profile, metric="cosine"):
+        """profile 과 모든 국가의 점수 (cosine: 유사도, 클수록 비슷 / l1: 거리, 작을수록 비슷)"""
+        profile = np.asarray(profile, dtype=float)
+        if metric == "cosine":
+            norm = np.linalg.norm(profile)
+            return self.unit @ (profile / (norm if norm else 1))
+        return np.abs(self.values - profile).sum(axis=1)
+
+    def nearest(self, profile, k=10, metric="cosine", exclude=None):
+        """profile 과 가장 비슷한 k개 국가 (국가, 점수) DataFrame"""
+        scores = self.scores(profile, metric)
+        key = -scores if metric == "cosine" else scores.copy()
+        if exclude is not None:
+            key[self._country_pos[exclude]] = np.inf
+
+        k = min(k, len(key) - (exclude is not None))
+        top = np.argpartition(key, k - 1)[:k] if k > 0 else np.empty(0, dtype=int)
+        top = top[np.argsort(key[top], kind="stable")]
+        label = "코사인 유사도" if metric == "cosine" else "L1 거리"
+        return pd.DataFrame({"Country": self.countries[top], label: scores[top]})
+
+    def pairwise(self, metric="cosine"):
+        """국가 × 국가 유사도(코사인) 또는 거리(L1) 행렬"""
+        if metric not in self._pairwise:
+            n = len(self.values)
+            result = np.empty((n, n))
+            for start in range(0, n, self.BLOCK_ROWS):
+                stop = min(start + self.BLOCK_ROWS, n)
+                if metric == "cosine":
+                    result[start:stop] = self.unit[start:stop] @ self.unit.T
+                else:
+                    block = self.values[start:stop, None, :] - self.values[None, :, :]
+                    result[start:stop] = np.abs(block).sum(axis=2)
+            self._pairwise[metric] = result
+        return self._pairwise[metric]
+
+    def cluster_order(self):
+        """
+        비슷한 국가끼리 붙도록 한 행 순서 (히트맵용).
+        주성분 두 개 평면에서의 각도로 정렬한다 — N×16 SVD 한 번이라 국가 수가 많아도 가볍다.
+        """
+        if self._order is None:
+            centered = self.values - self.values.mean(axis=0)
+            _, _, vt = np.linalg.svd(centered, full_matrices=False)
+            coords = centered @ vt[:2].T
+            self._order = np.argsort(np.arctan2(coords[:, 1], coords[:, 0]), kind="stable")
+        return self._order
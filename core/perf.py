@@ -0,0 +1,508 @@
+"""
+rerun 한 번 안에서 시간이 어디에 쓰이는지 재는 계측 계층
+
+페이지는 맨 위에서 ``perf.begin(__file__)``, 맨 끝에서 ``perf.finish()`` 를 부르고
+(중간에 멈출 때는 st.stop() 대신 ``perf.stop()``), 구간을 이름 붙여 감싼다::
+
+    with perf.phase("load"):
+        dataset, report = data.alerts()
+    with perf.phase("filter"):
+        ...
+
+구간 이름은 PHASES(데이터 로드·필터·집계·그래프 생성·화면 출력)를 쓴다.
+구간 안에서 다른 구간이 시작되면 바깥 구간은 잠시 멈추므로, 각 구간의 시간은 서로 겹치지 않는다
+(예: render 안에서 figcache 가 그래프를 새로 만들면 그 시간은 figure 로 잡힌다).
+
+캐시 적중·실패는 core.data(프로세스 캐시), core.datasets(Arrow 파일), core.figcache(그래프),
+``perf.cache_resource`` 로 감싼 페이지 로더가 ``cache_event`` 로 알려 준다.
+
+결과는 세 곳으로 나간다.
+- rerun 마다 JSON 한 줄 — 크기 제한이 있는 회전 로그 (PERF_LOG, 기본 .cache/perf/reruns.{pid}.jsonl)
+- Prometheus 텍스트 형식 파일 — node exporter 의 textfile collector 용 (PERF_PROM, 기본 .cache/perf/app.{pid}.prom)
+- 디버그 사이드바 — 주소에 ``?debug=1`` 을 붙이거나 APP_DEBUG_PANEL=1 일 때만.
+  사이드바에서 다음 rerun 하나를 cProfile 로 측정해 볼 수 있다.
+
+워커 프로세스가 여럿이면 서로의 파일을 덮어쓰거나 로그 회전이 엉키지 않도록 프로세스마다 파일을 따로 쓰고,
+Prometheus 값에는 pid 레이블을 붙인다. 끝난 프로세스의 .prom 파일과 로그(백업 포함)는
+지워서 예전 값이 수집되지 않고 로그 전체 크기도 살아 있는 워커 수 × 4 × PERF_LOG_MB 를 넘지 않게 한다.
+
+APP_PERF=0 이면 모두 꺼지고 ``phase`` 등은 아무것도 하지 않는다.
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from core import CACHE_DIR
+
+ENABLED = os.environ.get("APP_PERF", "1") != "0"
+DEBUG_PANEL = os.environ.get("APP_DEBUG_PANEL", "0") == "1"
+# 파일 이름의 {pid} 는 워커 프로세스 번호로 바뀐다
+LOG_FILE = os.environ.get("PERF_LOG", os.path.join(CACHE_DIR, "perf", "reruns.{pid}.jsonl"))
+LOG_MAX_BYTES = int(float(os.environ.get("PERF_LOG_MB", "5")) * 1024 ** 2)
+LOG_BACKUPS = 3
+PROM_FILE = os.environ.get("PERF_PROM", os.path.join(CACHE_DIR, "perf", "app.{pid}.prom"))
+# Prometheus 파일은 rerun 마다가 아니라 이 간격(초)마다 한 번만 다시 쓴다
+PROM_INTERVAL = float(os.environ.get("PERF_PROM_INTERVAL", "10"))
+
+PHASES = ("load", "filter", "aggregate", "figure", "render")
+# rerun 시간 히스토그램 구간 경계(초)
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_LINES = 30
+
+# session_state 키
+_DEBUG_KEY = "_perf_debug"
+_ARM_KEY = "_perf_profile"
+_PROFILE_KEY = "_perf_profile_result"
+
+
+class Rerun:
+    """rerun 하나의 구간별 시간(초)과 캐시 적중·실패"""
+
+    def __init__(self, page, profiler=None):
+        self.page = page
+        self.started = time.time()
+        self.total = None
+        self.phases = {}        # 구간 이름 → 초
+        self.cache = {}         # (캐시, 이름) → [적중, 실패]
+        self.profiler = profiler
+        self._start = time.perf_counter()
+        self._stack = []        # [구간 이름, 다시 시작한 시각]
+
+    def push(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1], now)
+        self._stack.append([name, now])
+
+    def pop(self):
+        now = time.perf_counter()
+        self._charge(self._stack.pop(), now)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _charge(self, entry, now):
+        self.phases[entry[0]] = self.phases.get(entry[0], 0.0) + now - entry[1]
+
+    def close(self):
+        now = time.perf_counter()
+        while self._stack:
+            self._charge(self._stack.pop(), now)
+        self.total = now - self._start
+
+    @property
+    def other(self):
+        """어느 구간에도 들어가지 않은 시간"""
+        return max(self.total - sum(self.phases.values()), 0.0)
+
+    def record(self):
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "page": self.page,
+            "total_s": round(self.total, 4),
+            "phases": {name: round(s, 4) for name, s in self.phases.items()},
+            "other_s": round(self.other, 4),
+            "cache": {f"{cache}:{name}": counts for (cache, name), counts in self.cache.items()},
+            "pid": os.getpid(),
+            "profiled": self.profiler is not None,
+        }
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_profile_lock = threading.Lock()   # cProfile 은 프로세스에서 한 번에 하나만
+_profiling = None                  # (프로파일 중인 Rerun, 그 스레드)
+
+# 프로세스 전체 누적 (Prometheus 파일용)
+_reruns = {}            # page → [횟수, 합계 초, 구간별 횟수...]
+_phase_totals = {}      # (page, phase) → 합계 초
+_cache_totals = {}      # (cache, name, "hit"/"miss") → 횟수
+_log = None
+_log_ready = False
+_prom_written = 0.0
+_prom_cleaned = False
+
+
+def current():
+    """이 스레드(세션의 스크립트 스레드)에서 진행 중인 Rerun, 없으면 None"""
+    return getattr(_local, "run", None)
+
+
+@contextlib.contextmanager
+def phase(name):
+    """name 구간으로 시간을 잰다. 진행 중인 rerun 이 없으면 아무것도 하지 않는다."""
+    run = current()
+    if run is None:
+        yield
+        return
+    run.push(name)
+    try:
+        yield
+    finally:
+        # perf.stop() 이 구간 안에서 불려 이미 닫혔으면 건너뛴다
+        if run._stack:
+            run.pop()
+
+
+def cache_event(cache, name, hit):
+    """캐시 cache 의 name 항목 조회 결과를 센다 (hit=True 적중, False 실패)"""
+    if not ENABLED:
+        return
+    key = (cache, name, "hit" if hit else "miss")
+    with _lock:
+        _cache_totals[key] = _cache_totals.get(key, 0) + 1
+    run = current()
+    if run is not None:
+        counts = run.cache.setdefault((cache, name), [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+# -------------------------------
+# st.cache_resource 로더의 적중·실패
+# -------------------------------
+def cache_resource(func):
+    """
+    st.cache_resource 대신 쓰는 데코레이터. 캐시는 그대로 st.cache_resource 가 하고,
+    함수 본문이 실제로 실행됐는지(실패) 아닌지(적중)를 cache_event("resource", 함수 이름) 로 센다.
+    """
+    import streamlit as st
+
+    @functools.wraps(func)
+    def body(*args, **kwargs):
+        _local.loading[-1] = True
+        return func(*args, **kwargs)
+
+    cached = st.cache_resource(body)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # 로더 안에서 다른 로더를 부를 수 있으므로 호출마다 표시를 하나씩 쌓는다
+        if not hasattr(_local, "loading"):
+            _local.loading = []
+        _local.loading.append(False)
+        try:
+            value = cached(*args, **kwargs)
+        finally:
+            missed = _local.loading.pop()
+        cache_event("resource", func.__name__, not missed)
+        return value
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+# -------------------------------
+# rerun 시작·끝
+# -------------------------------
+def begin(script):
+    """페이지 스크립트 맨 위에서 부른다. script 는 보통 __file__."""
+    global _profiling
+    if not ENABLED:
+        return None
+    import streamlit as st
+
+    state = st.session_state
+    if st.query_params.get("debug") == "1":
+        state[_DEBUG_KEY] = True
+
+    _drop_stale_profile()
+
+    # 프로파일 버튼을 누른 rerun 은 건너뛰고, 그 다음 rerun(사용자의 다음 조작)을 잰다
+    profiler = None
+    arm = state.get(_ARM_KEY)
+    if arm == "armed":
+        state[_ARM_KEY] = "next"
+    elif arm == "next":
+        del state[_ARM_KEY]
+        if _profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+
+    run = Rerun(os.path.splitext(os.path.basename(script))[0], profiler)
+    _local.run = run
+    if profiler is not None:
+        with _lock:
+            _profiling = (run, threading.current_thread())
+        profiler.enable()
+    return run
+
+
+def _end_profile(run):
+    """run 의 프로파일을 끝내고 잠금을 푼다. 이미 다른 곳에서 끝냈으면 False."""
+    global _profiling
+    with _lock:
+        if _profiling is None or _profiling[0] is not run:
+            return False
+        _profiling = None
+    run.profiler.disable()
+    _profile_lock.release()
+    return True
+
+
+def _drop_stale_profile():
+    """
+    프로파일하던 rerun 이 finish() 없이 끝났으면(예외, 위젯 조작으로 인한 RerunException)
+    잠금을 풀어 둔다. 그 스레드가 지금 스레드이거나 이미 끝난 스레드일 때만 남은 것으로 본다.
+    """
+    with _lock:
+        entry = _profiling
+    if entry is not None:
+        run, thread = entry
+        if thread is threading.current_thread() or not thread.is_alive():
+            _end_profile(run)
+
+
+def finish():
+    """페이지 스크립트 끝에서 부른다. 기록을 내보내고, 켜져 있으면 디버그 사이드바를 그린다."""
+    run = current()
+    if run is None:
+        return None
+    _local.run = None
+    run.close()
+
+    profile_text = None
+    if run.profiler is not None and _end_profile(run):
+        out = io.StringIO()
+        pstats.Stats(run.profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        profile_text = out.getvalue()
+
+    _accumulate(run)
+    _write_log(run)
+    _write_prometheus()
+
+    import streamlit as st
+
+    if profile_text is not None:
+        st.session_state[_PROFILE_KEY] = (run.page, run.total, profile_text)
+    if DEBUG_PANEL or st.session_state.get(_DEBUG_KEY):
+        _panel(run)
+    return run
+
+
+def stop():
+    """st.stop() 대신 부른다 — 계측을 마친 뒤 스크립트를 멈춘다"""
+    import streamlit as st
+
+    finish()
+    st.stop()
+
+
+# -------------------------------
+# 내보내기 (JSON 줄 로그, Prometheus 파일)
+# -------------------------------
+def _accumulate(run):
+    with _lock:
+        entry = _reruns.setdefault(run.page, [0, 0.0] + [0] * len(BUCKETS))
+        entry[0] += 1
+        entry[1] += run.total
+        for i, bound in enumerate(BUCKETS):
+            if run.total <= bound:
+                entry[2 + i] += 1
+        for name, seconds in run.phases.items():
+            _phase_totals[(run.page, name)] = _phase_totals.get((run.page, name), 0.0) + seconds
+
+
+def _logger():
+    """회전 로그 파일 핸들러 (처음 쓸 때 만든다). 폴더를 만들 수 없으면 None."""
+    global _log, _log_ready
+    with _lock:
+        if not _log_ready:
+            _log_ready = True
+            try:
+                path = log_file()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _remove_dead_files(LOG_FILE)
+                handler = RotatingFileHandler(
+                    path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+                )
+            except OSError:
+                return None
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _log = logging.getLogger("app.perf")
+            _log.setLevel(logging.INFO)
+            _log.propagate = False
+            _log.addHandler(handler)
+        return _log
+
+
+def _write_log(run):
+    log = _logger()
+    if log is not None:
+        log.info(json.dumps(run.record(), ensure_ascii=False))
+
+
+def log_file():
+    return LOG_FILE.format(pid=os.getpid())
+
+
+def prom_file():
+    return PROM_FILE.format(pid=os.getpid())
+
+
+def _label(**labels):
+    """Prometheus 레이블 (모든 값에 pid 를 붙여 워커 프로세스를 구분한다)"""
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    labels = {"pid": os.getpid(), **labels}
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text():
+    """지금까지의 누적값을 Prometheus 텍스트 형식으로"""
+    from core import figcache
+
+    with _lock:
+        reruns = {page: list(entry) for page, entry in _reruns.items()}
+        phase_totals = dict(_phase_totals)
+        cache_totals = dict(_cache_totals)
+
+    lines = [
+        "# HELP app_rerun_seconds Page script rerun duration.",
+        "# TYPE app_rerun_seconds histogram",
+    ]
+    for page, entry in sorted(reruns.items()):
+        for bound, count in zip(BUCKETS, entry[2:]):
+            lines.append(f"app_rerun_seconds_bucket{_label(page=page, le=bound)} {count}")
+        lines.append(f"app_rerun_seconds_bucket{_label(page=page, le='+Inf')} {entry[0]}")
+        lines.append(f"app_rerun_seconds_sum{_label(page=page)} {entry[1]:.6f}")
+        lines.append(f"app_rerun_seconds_count{_label(page=page)} {entry[0]}")
+
+    lines += [
+        "# HELP app_phase_seconds_total Time spent in each named phase of page reruns.",
+        "# TYPE app_phase_seconds_total counter",
+    ]
+    for (page, name), seconds in sorted(phase_totals.items()):
+        lines.append(f"app_phase_seconds_total{_label(page=page, phase=name)} {seconds:.6f}")
+
+    lines += [
+        "# HELP app_cache_requests_total Cache lookups by cache, entry and result.",
+        "# TYPE app_cache_requests_total counter",
+    ]
+    for (cache, name, result), count in sorted(cache_totals.items()):
+        lines.append(f"app_cache_requests_total{_label(cache=cache, name=name, result=result)} {count}")
+
+    figures = figcache.cache()
+    lines += [
+        "# HELP app_figure_cache_bytes Bytes held by the rendered figure cache.",
+        "# TYPE app_figure_cache_bytes gauge",
+        f"app_figure_cache_bytes{_label()} {figures.nbytes}",
+        "# HELP app_figure_cache_entries Entries in the rendered figure cache.",
+        "# TYPE app_figure_cache_entries gauge",
+        f"app_figure_cache_entries{_label()} {len(figures)}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _write_prometheus(force=False):
+    global _prom_written, _prom_cleaned
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _prom_written < PROM_INTERVAL:
+            return
+        _prom_written = now
+        first, _prom_cleaned = not _prom_cleaned, True
+    path = prom_file()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if first:
+            _remove_dead_files(PROM_FILE)
+        # textfile collector 가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 바꿔치기한다
+        # (.tmp 로 끝나므로 collector 가 읽는 *.prom 에 걸리지 않는다)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _remove_dead_files(pattern):
+    """
+    pattern({pid} 가 든 파일 이름)으로 끝난 워커 프로세스가 남긴 파일을 지운다 (프로세스당 처음 쓸 때 한 번).
+    회전 로그의 백업(.1~.3)과 쓰다 만 임시 파일(.<번호>.tmp)도 함께 지운다.
+    """
+    if "{pid}" not in pattern:
+        return
+    prefix, suffix = os.path.basename(pattern).split("{pid}", 1)
+    folder = os.path.dirname(pattern)
+    name_re = re.compile(re.escape(prefix) + r"(\d+)" + re.escape(suffix) + r"(\.\d+|\.\d+\.tmp)?")
+    for name in os.listdir(folder):
+        match = name_re.fullmatch(name)
+        if match is None or int(match.group(1)) == os.getpid():
+            continue
+        try:
+            os.kill(int(match.group(1)), 0)
+        except ProcessLookupError:
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+        except PermissionError:  # 다른 사용자의 살아 있는 프로세스
+            pass
+
+
+# -------------------------------
+# 디버그 사이드바
+# -------------------------------
+def _arm_profile():
+    import streamlit as st
+
+    st.session_state[_ARM_KEY] = "armed"
+
+
+def _panel(run):
+    import pandas as pd
+    import streamlit as st
+
+    sidebar = st.sidebar
+    sidebar.markdown("---")
+    sidebar.subheader("⏱️ 성능 (디버그)")
+    sidebar.caption(f"{run.page} · 이번 rerun {run.total * 1000:,.0f} ms")
+
+    timings = pd.DataFrame(
+        [(name, seconds) for name, seconds in run.phases.items()] + [("(기타)", run.other)],
+        columns=["구간", "초"],
+    )
+    timings["ms"] = (timings["초"] * 1000).round(1)
+    timings["비율"] = (timings["초"] / run.total * 100).round(1) if run.total else 0.0
+    sidebar.dataframe(timings.drop(columns="초"), hide_index=True, use_container_width=True)
+
+    if run.cache:
+        sidebar.dataframe(
+            pd.DataFrame(
+                [(cache, name, hits, misses) for (cache, name), (hits, misses) in run.cache.items()],
+                columns=["캐시", "항목", "적중", "실패"],
+            ),
+            hide_index=True, use_container_width=True,
+        )
+
+    with _lock:
+        totals = {}
+        for (cache, _, result), count in _cache_totals.items():
+            totals.setdefault(cache, {"hit": 0, "miss": 0})[result] += count
+    if totals:
+        sidebar.caption("프로세스 누적 적중률 · " + " · ".join(
+            f"{cache} {c['hit'] / (c['hit'] + c['miss']):.0%} ({c['hit'] + c['miss']:,}회)"
+            for cache, c in sorted(totals.items())
+        ))
+
+    arm = st.session_state.get(_ARM_KEY)
+    if arm:
+        sidebar.info("다음 조작(rerun)을 cProfile 로 측정합니다.")
+    else:
+        sidebar.button("다음 rerun cProfile 측정", on_click=_arm_profile, key="_perf_profile_button")
+    profiled = st.session_state.get(_PROFILE_KEY)
+    if profiled is not None:
+        page, total, text = profiled
+        with sidebar.expander(f"cProfile — {page} ({total * 1000:,.0f} ms)"):
+            st.code(text, language=None)
+
+    sidebar.caption(f"로그: {log_file()}  \nPrometheus: {prom_file()}")
@@ -0,0 +1,54 @@
+"""
+관광지(POI) 지도 대량 렌더링
+
+마커마다 folium.Marker·Popup 파이썬 객체를 만들지 않고,
+모든 지점을 [위도, 경도, 이름, 설명, 가까운 역] 배열 하나로 FastMarkerCluster 레이어에 넘긴다.
+마커와 팝업은 브라우저에서 클러스터를 펼칠 때 만들어지므로 10,000개 이상이어도 가볍다.
+
+완성된 지도 HTML 문자열은 페이지에서 캐시해 rerun·세션마다 다시 만들지 않는다.
+folium 은 지도를 처음 만들 때만 import 한다 (캐시된 HTML 을 쓸 때는 필요 없음).
+"""
+
+# row = [위도, 경도, 이름, 설명, 가까운 역]
+# 문자열은 textContent 로 넣어 HTML 로 해석되지 않게 한다
+MARKER_CALLBACK = """
+function (row) {
+    function text(tag, value, style) {
+        var el = document.createElement(tag);
+        el.textContent = value;
+        if (style) { el.style.cssText = style; }
+        return el;
+    }
+    var icon = L.AwesomeMarkers.icon({icon: "info-sign", markerColor: "pink", prefix: "glyphicon"});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(text("span", row[2]));
+    marker.bindPopup(function () {
+        var div = document.createElement("div");
+        div.style.fontFamily = "Arial";
+        div.appendChild(text("h4", row[2], "margin-bottom:6px;"));
+        div.appendChild(text("p", row[3], "margin:0;"));
+        var station = text("p", "", "margin:0;");
+        station.appendChild(text("b", "가까운 전철역: "));
+        station.appendChild(document.createTextNode(row[4]));
+        div.appendChild(station);
+        return div;
+    }, {maxWidth: 300});
+    return marker;
+}
+"""
+
+
+def map_html(pois, center, zoom_start=12):
+    """
+    pois: 이름·위도·경도·설명·가까운역 열이 있는 DataFrame
+    반환값: 지도 전체 HTML 문자열 (st.iframe 으로 그대로 표시)
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    m = folium.Map(location=center, zoom_start=zoom_start, tiles="CartoDB positron")
+    data = pois[["위도", "경도", "이름", "설명", "가까운역"]].astype(
+        {"위도": float, "경도": float, "이름": str, "설명": str, "가까운역": str}
+    ).values.tolist()
+    FastMarkerCluster(data=data, callback=MARKER_CALLBACK, name="관광지").add_to(m)
+    return m.get_root().render()
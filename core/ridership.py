@@ -0,0 +1,97 @@
+"""
+역별 승·하차 시계열과 이상치(급증·급감) 탐지
+
+모든 역을 한 번에 처리한다. 역별로 반복하지 않고 (날짜 × 역) 넓은 표 하나를 만든 뒤
+열 단위 벡터 연산으로 아래를 계산해 둔다.
+- 일별 승하차 합계, 전일 대비 증감
+- 평일·주말 평균과 요일별 평균
+- 역마다 직전 window 일 대비 rolling z-score (|z| 가 큰 날 = 이상치 후보)
+  평일·주말 차이는 역별 평일/주말 평균으로 나누어 없앤 뒤 비교한다.
+"""
+import numpy as np
+import pandas as pd
+
+WEEKDAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def station_totals(df):
+    """
+    (사용일자, 노선명, 역명) 별 승차·하차·승하차합계.
+    날짜·호선 순으로, 같은 날짜·호선 안에서는 승하차합계가 많은 역부터 정렬한다.
+    """
+    totals = (
+        df.groupby(["사용일자", "노선명", "역명"], sort=False, observed=True)[["승차총승객수", "하차총승객수"]]
+        .sum()
+        .reset_index()
+    )
+    totals["승하차합계"] = totals["승차총승객수"].astype("int64") + totals["하차총승객수"]
+    return totals.sort_values(
+        ["사용일자", "노선명", "승하차합계"], ascending=[True, True, False], ignore_index=True
+    )
+
+
+class RidershipSeries:
+    def __init__(self, df, window=7, min_periods=5):
+        # df 는 원본 행이나 station_totals 표 (역별로 다시 더하므로 둘 다 된다)
+        daily = (
+            df.assign(승하차합계=df["승차총승객수"].astype("int64") + df["하차총승객수"])
+            .groupby(["사용일자", "역명"], observed=True)["승하차합계"]
+            .sum()
+            .unstack("역명")
+        )
+        # 데이터가 빠진 날도 칸을 두어 전일 대비·rolling 계산이 날짜 기준으로 맞게 한다
+        full_range = pd.date_range(daily.index.min(), daily.index.max(), freq="D")
+        self.daily = daily.reindex(full_range).astype(float)
+        self.daily.index.name = "사용일자"
+        self.window = window
+
+        # 전일 대비 증감
+        self.delta = self.daily.diff()
+
+        # 요일별 평균, 평일·주말 평균
+        dow = self.daily.index.dayofweek
+        day_type = np.where(dow >= 5, "주말", "평일")
+        self.weekday_profile = self.daily.groupby(dow).mean().rename(index=dict(enumerate(WEEKDAY_NAMES)))
+        self.weekend_profile = self.daily.groupby(day_type).mean().T
+
+        # 주말에 줄어드는 건 이상치가 아니므로, 평일·주말 평균으로 나눈 비율로 비교한다.
+        # 역마다 직전 window 일(당일 제외) 비율의 평균·표준편차 대비 z-score
+        expected = self.weekend_profile.T.reindex(day_type).set_axis(self.daily.index)
+        ratio = self.daily / expected
+        base = ratio.shift(1).rolling(window, min_periods=min_periods)
+        mean = base.mean()
+        std = base.std().replace(0, np.nan)
+        self.zscore = (ratio - mean) / std
+        # 직전 추세를 그 날의 요일 유형에 맞춰 되돌린 "예상 인원"
+        self.rolling_mean = mean * expected
+
+        # 역 목록은 기간 전체 이용객이 많은 순
+        self.stations = list(self.daily.sum().sort_values(ascending=False).index)
+
+        # 이상치 후보를 |z| 큰 순으로 한 번 정렬해 두면 임계값 필터는 앞부분 자르기만 하면 된다
+        ranked = pd.DataFrame({
+            "승하차합계": self.daily.stack(),
+            "예상인원": self.rolling_mean.stack(),
+            "z": self.zscore.stack(),
+        }).dropna(subset=["z"])
+        ranked["abs_z"] = ranked["z"].abs()
+        self._ranked = ranked.sort_values("abs_z", ascending=False).reset_index()
+        self._ranked_abs = self._ranked["abs_z"].to_numpy()
+
+    def station(self, name):
+        """역 하나의 일별 표 (합계, 예상 인원, 전일 대비, z)"""
+        return pd.DataFrame({
+            "승하차합계": self.daily[name],
+            "예상인원": self.rolling_mean[name],
+            "전일대비": self.delta[name],
+            "z": self.zscore[name],
+        })
+
+    def anomalies(self, threshold=3.0, station=None):
+        """|z| >= threshold 인 (날짜, 역) 목록, |z| 큰 순"""
+        # _ranked_abs 는 내림차순이므로 -값으로 searchsorted
+        count = np.searchsorted(-self._ranked_abs, -threshold, side="right")
+        result = self._ranked.iloc[:count]
+        if station is not None:
+            result = result[result["역명"] == station]
+        return result.drop(columns="abs_z").reset_index(drop=True)
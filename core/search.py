@@ -0,0 +1,131 @@
+"""
+안내문자 본문(송출내용) 전문 검색용 문자 n-gram 역색인
+
+한국어는 띄어쓰기·조사 때문에 단어 단위 색인이 잘 맞지 않아 문자 2-gram 을 쓴다.
+(1글자 검색어를 위해 1-gram 도 함께 색인한다.)
+
+- 검색어의 n-gram 게시 목록(posting list)을 교집합해 후보를 좁힌 뒤,
+  후보 본문에서만 실제 부분 문자열 포함 여부를 확인한다. 전체 행을 훑지 않는다.
+- 새 행이 뒤에 추가되면 그 행들만 색인에 더한다 (sync).
+  마지막으로 맞춘 데이터 키를 기억해 두어, 키가 같으면 본문을 다시 비교하지 않는다.
+"""
+import re
+import threading
+
+import numpy as np
+
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def normalize(text):
+    return str(text).lower()
+
+
+def _body(text):
+    """색인에 넣는 본문 (문자열이 아닌 값 — 빈 칸(NaN) 등 — 은 빈 문자열)"""
+    return normalize(text) if isinstance(text, str) else ""
+
+
+def parse_query(query):
+    """'태풍 "해안가 접근"' → ["태풍", "해안가 접근"] (따옴표는 구절 검색)"""
+    terms = []
+    for phrase, word in QUERY_PATTERN.findall(query or ""):
+        term = normalize(phrase or word).strip()
+        if term:
+            terms.append(term)
+    return terms
+
+
+def grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class AlertSearchIndex:
+    """행 번호(0부터)를 문서 번호로 쓰는 n-gram 역색인"""
+
+    def __init__(self, n=2):
+        self.n = n
+        self.key = None      # 마지막으로 sync 한 데이터 키
+        self.texts = []
+        self._postings = {}  # gram → 문서 번호 배열 (오름차순)
+        self._pending = {}   # gram → 아직 배열에 합치지 않은 새 문서 번호
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # 여러 세션이 동시에 sync 해도 한 번만 색인
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, texts):
+        """문서를 뒤에 이어서 색인한다."""
+        with self._lock:
+            for text in texts:
+                doc = len(self.texts)
+                text = _body(text)
+                self.texts.append(text)
+                for gram in grams(text, 1) | grams(text, self.n):
+                    self._pending.setdefault(gram, []).append(doc)
+
+    def sync(self, texts, key=None):
+        """
+        texts(전체 본문 목록)와 색인을 맞춘다.
+        앞부분이 그대로이고 뒤에 행만 늘었으면 늘어난 행만 색인하고,
+        그렇지 않으면(행 삭제·수정) 처음부터 다시 만든다. 새로 색인한 행 수를 반환.
+        key(원본 데이터 키)가 마지막으로 맞춘 키와 같으면 아무것도 하지 않는다.
+        """
+        with self._sync_lock:
+            if key is not None and key == self.key:
+                return 0
+            texts = list(texts)
+            size = len(self.texts)
+            # 마지막 행만 보면 중간 행 수정을 놓치므로, 이미 색인한 앞부분 전체를 비교한다
+            unchanged = size <= len(texts) and [_body(t) for t in texts[:size]] == self.texts
+            if not unchanged:
+                with self._lock:
+                    self.texts = []
+                    self._postings = {}
+                    self._pending = {}
+                size = 0
+            self.add(texts[size:])
+            self.key = key
+            return len(texts) - size
+
+    def _posting(self, gram):
+        pending = self._pending.pop(gram, None)
+        if pending:
+            current = self._postings.get(gram)
+            extra = np.array(pending, dtype=np.int32)
+            self._postings[gram] = extra if current is None else np.concatenate([current, extra])
+        return self._postings.get(gram)
+
+    def _candidates(self, term):
+        n = self.n if len(term) >= self.n else 1
+        result = None
+        # 게시 목록이 짧은 gram 부터 교집합해야 빠르다
+        lists = [self._posting(g) for g in grams(term, n)]
+        if any(p is None for p in lists):
+            return np.empty(0, dtype=np.int32)
+        for posting in sorted(lists, key=len):
+            result = posting if result is None else np.intersect1d(result, posting, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
+
+    def search(self, query):
+        """모든 검색어(AND)를 포함하는 문서 번호 배열 (오름차순)"""
+        terms = parse_query(query)
+        if not terms:
+            return np.empty(0, dtype=np.int32)
+
+        with self._lock:
+            result = None
+            for term in sorted(terms, key=len, reverse=True):
+                docs = self._candidates(term)
+                if result is not None:
+                    docs = np.intersect1d(result, docs, assume_unique=True)
+                # n-gram 이 모두 들어 있어도 연속된 문자열이 아닐 수 있어 실제 포함 여부를 확인
+                if len(term) > self.n:
+                    docs = np.array([d for d in docs if term in self.texts[d]], dtype=np.int32)
+                result = docs
+                if len(result) == 0:
+                    break
+        return result
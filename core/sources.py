@@ -0,0 +1,138 @@
+"""
+원본 데이터 파일(CSV) 읽기 — 인코딩 판별과 내용 해시
+
+- 파일마다 인코딩(utf-8 / utf-8-sig / cp949)을 한 번만 판별한다.
+- 같은 순회에서 내용 SHA-1 해시도 구해, 파싱 결과 캐시 키로 쓴다.
+  파일을 덮어써서 수정시각만 바뀌고 내용이 같으면 해시도 같으므로 다시 파싱하지 않는다.
+- 판별·해시 결과는 (경로, 크기, 수정시각) 별로 기억하고 캐시 폴더의 fingerprints.json 에도 남기므로,
+  파일이 그대로면 새로 뜬 워커 프로세스에서도 os.stat 한 번으로 끝난다.
+"""
+import codecs
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from core import CACHE_DIR, ROOT_DIR
+
+DATA_DIR = os.environ.get("APP_DATA_DIR", ROOT_DIR)
+BLOCK_BYTES = 1 << 20
+FINGERPRINT_FILE = os.path.join(CACHE_DIR, "fingerprints.json")
+
+# 앞에서부터 시도하는 인코딩. 어느 것으로도 안 되면 마지막 것을 깨진 글자 치환으로 쓴다.
+ENCODINGS = ("utf-8", "cp949")
+
+
+class Fingerprint:
+    """파일 하나의 인코딩·내용 해시와, 그 값을 구할 때의 크기·수정시각"""
+
+    def __init__(self, path, size, mtime_ns, encoding, errors, digest):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.encoding = encoding
+        self.errors = errors
+        self.digest = digest
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+
+_fingerprints = None
+_lock = threading.Lock()
+
+
+def _known():
+    """기억해 둔 Fingerprint 들 (처음 부를 때 fingerprints.json 에서 읽는다). _lock 안에서 부른다."""
+    global _fingerprints
+    if _fingerprints is None:
+        _fingerprints = {}
+        try:
+            with open(FINGERPRINT_FILE, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        for path, entry in saved.items():
+            _fingerprints[path] = Fingerprint(path, **entry)
+    return _fingerprints
+
+
+def _save(known):
+    """fingerprints.json 갱신 (_lock 안에서 부른다)"""
+    saved = {
+        path: {k: getattr(fp, k) for k in ("size", "mtime_ns", "encoding", "errors", "digest")}
+        for path, fp in known.items()
+    }
+    os.makedirs(os.path.dirname(FINGERPRINT_FILE), exist_ok=True)
+    tmp = f"{FINGERPRINT_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(saved, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, FINGERPRINT_FILE)
+
+
+def path(name):
+    """데이터 폴더 안의 파일 경로"""
+    return os.path.join(DATA_DIR, name)
+
+
+def _scan(path, size, mtime_ns):
+    """파일을 블록 단위로 한 번 읽으면서 해시를 구하고, 각 인코딩으로 디코딩이 되는지 본다"""
+    sha1 = hashlib.sha1()
+    decoders = {enc: codecs.getincrementaldecoder(enc)() for enc in ENCODINGS}
+    bom = None
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(BLOCK_BYTES)
+            final = not block
+            if bom is None:
+                bom = block.startswith(codecs.BOM_UTF8)
+            sha1.update(block)
+            for enc in list(decoders):
+                try:
+                    decoders[enc].decode(block, final=final)
+                except UnicodeDecodeError:
+                    del decoders[enc]
+            if final:
+                break
+
+    encoding = next((enc for enc in ENCODINGS if enc in decoders), None)
+    errors = "strict"
+    if encoding is None:
+        encoding, errors = ENCODINGS[-1], "replace"
+    if encoding == "utf-8" and bom:
+        encoding = "utf-8-sig"
+    return Fingerprint(path, size, mtime_ns, encoding, errors, sha1.hexdigest())
+
+
+def fingerprint(path):
+    """
+    path 의 Fingerprint. 크기·수정시각이 지난번과 같으면 기억해 둔 값을 돌려주고,
+    다르면 파일을 다시 읽어 인코딩과 해시를 구한다.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    with _lock:
+        known = _known().get(path)
+    if known is not None and (known.size, known.mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return known
+
+    found = _scan(path, st.st_size, st.st_mtime_ns)
+    with _lock:
+        known = _known()
+        known[path] = found
+        _save(known)
+    return found
+
+
+def content_hash(path):
+    """파일 내용의 SHA-1 (16진수 문자열)"""
+    return fingerprint(path).digest
+
+
+def read_csv(path, **kwargs):
+    """판별해 둔 인코딩으로 CSV 를 읽는다. 나머지 인자는 pd.read_csv 로 넘긴다."""
+    fp = fingerprint(path)
+    return pd.read_csv(path, encoding=fp.encoding, encoding_errors=fp.errors, **kwargs)
@@ -0,0 +1,133 @@
+"""
+지하철역 좌표 공간 색인 (가까운 역 찾기)
+
+역 좌표 표(stations.csv: 역명, 노선, 위도, 경도)를 약 1km 격자 칸으로 나누어 두고,
+질의 지점 주변 칸부터 바깥쪽으로 넓혀 가며 후보 역만 haversine 거리로 비교한다.
+k번째로 가까운 역까지의 거리가 아직 보지 않은 칸까지의 최소 거리보다 작으면 멈추므로
+결과는 전체를 비교한 것과 같고, 역·관광지가 수천 개여도 지점 하나에 1ms 미만이 걸린다.
+
+역명은 subway.csv 의 역명과 같게 적어 두어 승·하차 인원과 바로 조인할 수 있다.
+좌표표에 없는 역은 찾을 수 없으므로, 가장 가까운 역이 MAX_NEAREST_KM 보다 멀면
+좌표표가 그 지역을 덮지 못한 것일 수 있다 (화면에서 경고한다).
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.195
+# 서울 시내에서 가장 가까운 역이 이보다 멀면 좌표표에 빠진 역이 있는 것으로 본다
+MAX_NEAREST_KM = 2.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """위경도(도) 사이 거리 (km). 배열끼리 브로드캐스트된다."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class StationIndex:
+    def __init__(self, stations, cell_km=1.0):
+        self.stations = stations.reset_index(drop=True)
+        self.lat = self.stations["위도"].to_numpy(dtype=float)
+        self.lon = self.stations["경도"].to_numpy(dtype=float)
+
+        # 위도 방향 칸 크기는 어디서나 같고, 경도 방향은 평균 위도 기준으로 cell_km 가 되게 한다
+        mean_lat = np.radians(self.lat.mean()) if len(self.lat) else 0.0
+        self.lat_step = cell_km / KM_PER_DEG_LAT
+        self.lon_step = cell_km / (KM_PER_DEG_LAT * np.cos(mean_lat))
+
+        rows = np.floor(self.lat / self.lat_step).astype(int)
+        cols = np.floor(self.lon / self.lon_step).astype(int)
+        self.buckets = {}
+        for i, key in enumerate(zip(rows, cols)):
+            self.buckets.setdefault(key, []).append(i)
+        self.buckets = {key: np.array(idx) for key, idx in self.buckets.items()}
+
+        self.row_range = (rows.min(), rows.max()) if len(rows) else (0, -1)
+        self.col_range = (cols.min(), cols.max()) if len(cols) else (0, -1)
+
+    def __len__(self):
+        return len(self.stations)
+
+    def _ring(self, row, col, r):
+        """(row, col) 칸에서 체비쇼프 거리가 정확히 r 인 칸들에 있는 역 번호"""
+        found = []
+        for i in range(row - r, row + r + 1):
+            for j in (range(col - r, col + r + 1) if abs(i - row) == r else (col - r, col + r)):
+                idx = self.buckets.get((i, j))
+                if idx is not None:
+                    found.append(idx)
+        return found
+
+    def query(self, lat, lon, k=3):
+        """(lat, lon) 에서 가까운 역 k개의 (역 번호 배열, 거리 km 배열) — 가까운 순"""
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=int), np.empty(0)
+
+        row = int(np.floor(lat / self.lat_step))
+        col = int(np.floor(lon / self.lon_step))
+        # 이 지점에서 한 칸 폭이 실제로 몇 km 인지 (짧은 쪽 기준)
+        cell_km = min(
+            self.lat_step * KM_PER_DEG_LAT,
+            self.lon_step * KM_PER_DEG_LAT * np.cos(np.radians(lat)),
+        )
+        max_ring = max(
+            abs(row - self.row_range[0]), abs(row - self.row_range[1]),
+            abs(col - self.col_range[0]), abs(col - self.col_range[1]),
+        )
+
+        candidates = []
+        r = 0
+        while True:
+            candidates += self._ring(row, col, r)
+            count = sum(len(c) for c in candidates)
+            if count >= k:
+                idx = np.concatenate(candidates)
+                dist = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+                kth = np.partition(dist, k - 1)[k - 1]
+                # 아직 안 본 칸(r+1 번째 고리)까지의 최소 거리는 r * cell_km 이상
+                if kth <= r * cell_km or r >= max_ring:
+                    break
+            elif r >= max_ring:
+                break
+            r += 1
+
+        order = np.argsort(dist, kind="stable")[:k]
+        return idx[order], dist[order]
+
+    def query_many(self, lats, lons, k=3):
+        """여러 지점을 한 번에 질의: (지점 수 × k) 역 번호 배열과 거리 배열"""
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        k = min(k, len(self))
+        idx = np.empty((len(lats), k), dtype=int)
+        dist = np.empty((len(lats), k))
+        for n, (lat, lon) in enumerate(zip(lats, lons)):
+            idx[n], dist[n] = self.query(lat, lon, k)
+        return idx, dist
+
+    def nearest(self, lat, lon, k=3):
+        """가까운 역 k개 DataFrame (역명, 노선, 거리_km)"""
+        idx, dist = self.query(lat, lon, k)
+        result = self.stations.iloc[idx][["역명", "노선"]].reset_index(drop=True)
+        result["거리_km"] = dist
+        return result
+
+
+def recent_totals(ridership, days=7):
+    """
+    승·하차 데이터의 마지막 days 일 동안 역명별 승차·하차 합계.
+    같은 역명이 여러 노선에 있으면 합친다.
+    """
+    dates = ridership["사용일자"]
+    recent = ridership[dates > dates.max() - pd.Timedelta(days=days)]
+    return (
+        recent.groupby("역명", observed=True)[["승차총승객수", "하차총승객수"]]
+        .sum()
+        .astype("int64")
+    )
@@ -0,0 +1,204 @@
+"""
+월별 지하철 승·하차 CSV → 월 단위 Parquet 파티션 변환
+
+- 원본 폴더의 ``subway*.csv`` 파일들을 청크 단위로 읽어 메모리 사용량을 제한한다.
+  인코딩은 파일마다 판별한다 (core.sources).
+- 각 파일을 ``<캐시>/subway/month=YYYYMM/<원본이름>.parquet`` 파티션으로 저장한다.
+- manifest.json 에 원본 파일의 크기·수정시각·내용 해시를 기록해 두고, 내용이 바뀐 파일만 다시 파싱한다.
+- 사용일자는 변환할 때 한 번만 날짜로 파싱하고, 인원 수는 int32 로 저장한다.
+- 노선명·역명은 사전(dictionary) 인코딩으로 저장해, 읽을 때 문자열 객체를 만들지 않고 바로 범주형이 된다.
+
+명령줄에서 직접 실행할 수도 있다::
+
+    python -m core.subway_ingest [원본폴더] [출력폴더]
+"""
+import glob
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core import CACHE_DIR, sources
+
+SRC_DIR = os.environ.get("SUBWAY_SRC_DIR", sources.DATA_DIR)
+OUT_DIR = os.path.join(CACHE_DIR, "subway")
+SRC_PATTERN = "subway*.csv"
+CHUNK_ROWS = 100_000
+
+# 파티션 형식이 바뀌면 올려서 기존 파티션을 모두 다시 만들게 한다
+FORMAT_VERSION = 4
+
+COLUMNS = ["사용일자", "노선명", "역명", "승차총승객수", "하차총승객수"]
+SCHEMA = pa.schema([
+    ("사용일자", pa.date32()),
+    ("노선명", pa.dictionary(pa.int32(), pa.string())),
+    ("역명", pa.dictionary(pa.int32(), pa.string())),
+    ("승차총승객수", pa.int32()),
+    ("하차총승객수", pa.int32()),
+])
+
+
+def _source_files(src_dir):
+    files = glob.glob(os.path.join(src_dir, SRC_PATTERN))
+    files += glob.glob(os.path.join(src_dir, SRC_PATTERN.upper()))
+    return sorted(set(files))
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, "manifest.json")
+    tmp = f"{path}.{os.getpid()}.tmp"  # 여러 워커가 동시에 써도 서로의 임시 파일을 덮지 않게
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _partition_path(out_dir, month, name):
+    stem = os.path.splitext(name)[0]
+    return os.path.join(out_dir, f"month={month}", f"{stem}.parquet")
+
+
+def _remove_partitions(out_dir, name, months):
+    for month in months:
+        path = _partition_path(out_dir, month, name)
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # 없거나 다른 워커가 먼저 지움
+            pass
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:  # 다른 파티션이 남아 있거나 이미 지워짐
+            pass
+
+
+def _convert(src_path, out_dir):
+    """CSV 한 개를 청크 단위로 읽어 월별 파티션으로 나누어 쓴다. 만들어진 월 목록을 반환."""
+    name = os.path.basename(src_path)
+    writers = {}
+    tmp_paths = {}
+    try:
+        reader = sources.read_csv(
+            src_path,
+            usecols=COLUMNS,
+            dtype={"노선명": str, "역명": str},
+            chunksize=CHUNK_ROWS,
+        )
+        for chunk in reader:
+            chunk = chunk[COLUMNS]
+            months = chunk["사용일자"] // 100
+            chunk["사용일자"] = pd.to_datetime(chunk["사용일자"].astype(str), format="%Y%m%d")
+            for month, part in chunk.groupby(months, sort=False):
+                month = str(month)
+                if month not in writers:
+                    final = _partition_path(out_dir, month, name)
+                    os.makedirs(os.path.dirname(final), exist_ok=True)
+                    tmp_paths[month] = f"{final}.{os.getpid()}.tmp"
+                    writers[month] = pq.ParquetWriter(tmp_paths[month], SCHEMA)
+                table = pa.Table.from_pandas(part, schema=SCHEMA, preserve_index=False)
+                writers[month].write_table(table)
+    except Exception:
+        for writer in writers.values():
+            writer.close()
+        for tmp in tmp_paths.values():
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+
+    for month, writer in writers.items():
+        writer.close()
+        os.replace(tmp_paths[month], _partition_path(out_dir, month, name))
+    return sorted(writers)
+
+
+def ingest(src_dir=SRC_DIR, out_dir=OUT_DIR):
+    """
+    바뀐 원본만 다시 변환하고, 현재 파티션 상태를 나타내는 서명(signature)을 반환한다.
+    서명은 (형식 버전, (파일 이름, 내용 해시)...) 이며 캐시 키로 쓰면 된다 (원본 내용이 바뀌면 값이 달라짐).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _load_manifest(out_dir)
+    changed = False
+
+    # 파티션 형식이 예전 버전이면 전부 다시 변환
+    if manifest.get("version") != FORMAT_VERSION:
+        for name, entry in manifest.get("files", {}).items():
+            _remove_partitions(out_dir, name, entry["months"])
+        manifest = {"version": FORMAT_VERSION, "files": {}}
+        changed = True
+    files = manifest["files"]
+
+    found = {os.path.basename(p): p for p in _source_files(src_dir)}
+
+    # 사라진 원본 → 파티션 삭제
+    for name in list(files):
+        if name not in found:
+            _remove_partitions(out_dir, name, files.pop(name)["months"])
+            changed = True
+
+    # 새로 생겼거나 바뀐 원본 → 다시 변환
+    for name, path in found.items():
+        stamp = _stamp(path)
+        entry = files.get(name)
+        if entry and entry["size"] == stamp["size"] and entry["mtime_ns"] == stamp["mtime_ns"]:
+            continue
+        digest = sources.content_hash(path)
+        if entry and entry["sha1"] == digest:
+            # 수정시각만 바뀌고 내용은 같음 → 다시 파싱하지 않고 기록만 갱신
+            files[name] = {**entry, **stamp}
+        else:
+            if entry:
+                _remove_partitions(out_dir, name, entry["months"])
+            months = _convert(path, out_dir)
+            files[name] = {**stamp, "sha1": digest, "months": months}
+        changed = True
+
+    if changed:
+        _save_manifest(out_dir, manifest)
+
+    return (FORMAT_VERSION,) + tuple(
+        (name, entry["sha1"]) for name, entry in sorted(files.items())
+    )
+
+
+def partition_months(out_dir=OUT_DIR):
+    """저장되어 있는 파티션의 월 목록 (예: ["202509", "202510"])"""
+    dirs = glob.glob(os.path.join(out_dir, "month=*"))
+    return sorted(os.path.basename(d).split("=", 1)[1] for d in dirs)
+
+
+def load_partitions(out_dir=OUT_DIR, months=None):
+    """
+    파티션을 읽어 하나의 DataFrame 으로 합친다. months 를 주면 해당 월만 읽는다.
+    노선명·역명은 범주형으로 반환한다 (파일마다 다른 사전은 pandas 변환 때 하나로 합쳐진다).
+    """
+    if months is None:
+        months = partition_months(out_dir)
+    files = []
+    for month in months:
+        files += sorted(glob.glob(os.path.join(out_dir, f"month={month}", "*.parquet")))
+    if not files:
+        return SCHEMA.empty_table().to_pandas(date_as_object=False)
+    table = pa.concat_tables([pq.read_table(f, schema=SCHEMA) for f in files])
+    return table.to_pandas(date_as_object=False)
+
+
+if __name__ == "__main__":
+    src = sys.argv[1] if len(sys.argv) > 1 else SRC_DIR
+    out = sys.argv[2] if len(sys.argv) > 2 else OUT_DIR
+    signature = ingest(src, out)
+    print(f"{len(signature) - 1}개 원본 → 파티션 {', '.join(partition_months(out)) or '없음'} ({out})")
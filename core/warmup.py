@@ -0,0 +1,114 @@
+"""
+앱 시작 직후 백그라운드 준비 (콜드 스타트 단축)
+
+배포 직후 첫 방문자는 페이지마다 pandas·matplotlib·plotly·folium import 와
+데이터 로드·집계를 기다려야 했다. ``start()`` 를 부르면 워커 프로세스에서 한 번만
+스레드 풀을 띄워 아래를 병렬로 미리 해 둔다.
+
+- 무거운 모듈 import (한 번 import 되면 페이지의 import 문은 sys.modules 조회만 한다)
+- core.data 의 데이터셋·집계 로드 (프로세스 캐시와 메모리 맵 파일이 채워진다)
+
+이 모듈 자체는 표준 라이브러리만 import 하므로 main.py 에서 불러도 첫 화면이 늦어지지 않는다.
+작업이 실패해도(파일 없음 등) 기록만 하고, 해당 페이지가 열릴 때 원래대로 다시 시도한다.
+"""
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = int(os.environ.get("WARMUP_WORKERS", "4"))
+ENABLED = os.environ.get("APP_WARMUP", "1") != "0"
+
+HEAVY_MODULES = [
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "matplotlib.pyplot",
+    "plotly.graph_objects",
+    "plotly.express",
+    "folium",
+    "folium.plugins",
+]
+
+# (이름, core.data 의 함수 이름, 인자)
+DATASETS = [
+    ("mbti", "ranks", ()),
+    ("subway", "station_totals", ()),
+    ("alerts_D", "alert_cube", ("D",)),
+    ("alerts_h", "alert_cube", ("h",)),
+    ("stations", "stations", ()),
+    ("pois", "pois", ()),
+    ("districts", "districts", ()),
+]
+
+_lock = threading.Lock()
+_executor = None
+_tasks = {}
+
+
+class Task:
+    """백그라운드 작업 하나의 상태와 걸린 시간"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = None
+        self.error = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def run(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            fn(*args)
+        except Exception as exc:  # 준비 단계 실패는 페이지에서 다시 드러난다
+            self.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            self.seconds = time.perf_counter() - start
+
+
+def _load(func_name, *args):
+    data = importlib.import_module("core.data")
+    getattr(data, func_name)(*args)
+
+
+def start(max_workers=MAX_WORKERS):
+    """백그라운드 준비를 시작한다. 여러 번 불러도 프로세스당 한 번만 실행된다."""
+    global _executor
+    with _lock:
+        if _executor is not None or not ENABLED:
+            return _tasks
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup")
+
+        # import 를 먼저 넣어 두어, 데이터 작업이 쓰는 pandas 등을 import 가 끝나는 대로 바로 쓰게 한다
+        for module in HEAVY_MODULES:
+            task = _tasks[f"import {module}"] = Task(f"import {module}")
+            task.future = _executor.submit(task.run, importlib.import_module, module)
+        for name, func_name, args in DATASETS:
+            task = _tasks[name] = Task(name)
+            task.future = _executor.submit(task.run, _load, func_name, *args)
+        _executor.shutdown(wait=False)
+    return _tasks
+
+
+def wait(timeout=None):
+    """모든 준비 작업이 끝날 때까지 기다린다 (측정·테스트용). 다 끝났으면 True."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for task in list(_tasks.values()):
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            task.future.result(remaining)
+        except Exception:
+            return False
+    return True
+
+
+def status():
+    """작업 이름 → 걸린 시간(초) / "실행 중" / 오류 메시지"""
+    return {
+        name: (task.error or round(task.seconds, 3)) if task.done else "실행 중"
+        for name, task in _tasks.items()
+    }
@@ -1,4 +1,9 @@
 import streamlit as st
+from core import warmup
+
+# 다른 페이지에서 쓸 모듈·데이터를 백그라운드 스레드에서 미리 준비 (워커 프로세스당 한 번)
+warmup.start()
+
 st.title('우거지 해장국과 실존하는 진우')
 name=st.text_input('이름을 입력하세요:')
 menu=st.selectbox('좋아하는 음식을 선택해주세요:',['우거지해장국','정진우거지해장국'])
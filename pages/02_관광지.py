@@ -1,10 +1,11 @@
 # app.py
 import streamlit as st
-from streamlit_folium import st_folium
-import folium
-from folium.plugins import MarkerCluster
+import pandas as pd
+
+from core import data, perf, poimap, stations
 
 st.set_page_config(page_title="Seoul Top 10 - Map (Folium)", layout="wide")
+perf.begin(__file__)
 
 st.title("🌸 서울 외국인 인기 관광지 Top 10 (Folium 지도)")
 st.markdown(
@@ -18,59 +19,129 @@ SEOUL_CENTER = (37.5665, 126.9780)
 # Top10 장소 데이터
 places = [
     (1, "Gyeongbokgung Palace (경복궁)", 37.580467, 126.976944,
-     "조선의 대표 궁궐로, 광화문과 근정전이 유명합니다.", "경복궁역 (3호선)"),
+     "조선의 대표 궁궐로, 광화문과 근정전이 유명합니다."),
     (2, "Changdeokgung Palace (창덕궁 & 비원)", 37.579254, 126.992150,
-     "유네스코 세계유산으로 지정된 고궁으로, 후원이 특히 아름답습니다.", "안국역 (3호선)"),
+     "유네스코 세계유산으로 지정된 고궁으로, 후원이 특히 아름답습니다."),
     (3, "Bukchon Hanok Village (북촌한옥마을)", 37.582178, 126.983256,
-     "조용한 한옥 골목길과 전통문화체험이 가능한 마을입니다.", "안국역 (3호선)"),
+     "조용한 한옥 골목길과 전통문화체험이 가능한 마을입니다."),
     (4, "N Seoul Tower (남산타워)", 37.551170, 126.988228,
-     "서울 전경을 한눈에 볼 수 있는 전망대로, 야경이 특히 아름답습니다.", "명동역 (4호선)"),
+     "서울 전경을 한눈에 볼 수 있는 전망대로, 야경이 특히 아름답습니다."),
     (5, "Myeongdong (명동 쇼핑거리)", 37.560000, 126.985800,
-     "쇼핑, 패션, 화장품, 길거리음식이 즐비한 외국인 관광 1번지.", "명동역 (4호선)"),
+     "쇼핑, 패션, 화장품, 길거리음식이 즐비한 외국인 관광 1번지."),
     (6, "Insadong (인사동)", 37.574165, 126.984910,
-     "전통찻집, 공예품, 기념품 가게가 모여 있는 거리입니다.", "안국역 (3호선)"),
+     "전통찻집, 공예품, 기념품 가게가 모여 있는 거리입니다."),
     (7, "Hongdae (홍대 거리)", 37.555280, 126.923330,
-     "젊은이의 거리로 예술과 음악, 카페, 거리공연이 가득합니다.", "홍대입구역 (2호선, 공항철도)"),
+     "젊은이의 거리로 예술과 음악, 카페, 거리공연이 가득합니다."),
     (8, "Dongdaemun Design Plaza (동대문 DDP)", 37.566300, 127.009000,
-     "미래지향적 건축물과 디자인 전시, 야간 LED 장미정원으로 유명합니다.", "동대문역사문화공원역 (2·4·5호선)"),
+     "미래지향적 건축물과 디자인 전시, 야간 LED 장미정원으로 유명합니다."),
     (9, "Gwangjang Market (광장시장)", 37.570977, 126.998944,
-     "빈대떡과 육회비빔밥으로 유명한 서울 전통시장입니다.", "종로5가역 (1호선)"),
+     "빈대떡과 육회비빔밥으로 유명한 서울 전통시장입니다."),
     (10, "Yeouido Hangang Park (여의도 한강공원)", 37.527730, 126.932970,
-     "한강변을 따라 산책, 자전거, 야경을 즐길 수 있는 도심 속 공원입니다.", "여의나루역 (5호선)")
+     "한강변을 따라 산책, 자전거, 야경을 즐길 수 있는 도심 속 공원입니다.")
 ]
 
-# 지도 생성
-m = folium.Map(location=SEOUL_CENTER, zoom_start=12, tiles="CartoDB positron")
-mc = MarkerCluster().add_to(m)
-
-for rank, name, lat, lon, desc, station in places:
-    popup_html = (
-        "<div style='font-family:Arial;'>"
-        "<h4 style='margin-bottom:6px;'>"
-        "{rank}. {name}</h4>"
-        "<p style='margin:0;'>{desc}</p>"
-        "<p style='margin:0;'><b>가까운 전철역:</b> {station}</p>"
-        "</div>"
-    ).format(rank=rank, name=name, desc=desc, station=station)
-
-    folium.Marker(
-        location=(lat, lon),
-        popup=folium.Popup(popup_html, max_width=300),
-        tooltip=f"{rank}. {name}",
-        icon=folium.Icon(color="pink", icon="info-sign")
-    ).add_to(mc)
+# -------------------------------
+# 가까운 전철역 (역 좌표 공간 색인 + 최근 승·하차 인원)
+# 역 좌표표(stations.csv)로 색인을 한 번 만들고, 관광지마다 가까운 역 k개를 찾는다.
+# -------------------------------
+NEAREST_K = 3
+RECENT_DAYS = 7
+
+@perf.cache_resource
+def load_station_index(key):
+    return stations.StationIndex(data.stations()[0])
+
+@perf.cache_resource
+def load_recent_ridership(signature):
+    return stations.recent_totals(data.ridership()[0].df, days=RECENT_DAYS)
+
+with perf.phase("load"):
+    stations_key = data.stations()[1]
+    station_index = load_station_index(stations_key)
+    subway_signature = data.ridership()[0].key
+    ridership = load_recent_ridership(subway_signature)
+
+def nearest_stations(lat, lon):
+    near = station_index.nearest(lat, lon, k=NEAREST_K)
+    return near.join(ridership, on="역명")
+
+def station_labels(near):
+    """
+    역명·노선·거리_km·승하차 열이 있는 표 → "OO역 (N호선, 0.59km) · 최근 7일 ..." 문자열들.
+    거리가 stations.MAX_NEAREST_KM 보다 멀면 앞에 ⚠️ 를 붙인다.
+    """
+    labels = near["역명"] + "역 (" + near["노선"] + ", " + near["거리_km"].map("{:.2f}km".format) + ")"
+    # 좌표표에 없는 더 가까운 역이 있을 수 있으면 표시
+    labels = labels.where(near["거리_km"] <= stations.MAX_NEAREST_KM, "⚠️ " + labels)
+    has_data = near["승차총승객수"].notna()
+    traffic = (
+        f" · 최근 {RECENT_DAYS}일 승차 "
+        + near["승차총승객수"].fillna(0).map("{:,.0f}명".format)
+        + " / 하차 "
+        + near["하차총승객수"].fillna(0).map("{:,.0f}명".format)
+    )
+    return labels.where(~has_data, labels + traffic)
+
+with perf.phase("filter"):
+    nearest = {rank: nearest_stations(lat, lon) for rank, name, lat, lon, desc in places}
+
+# -------------------------------
+# 지도에 올릴 전체 지점
+# Top10 에 더해, 루트에 pois.csv(이름, 위도, 경도, 설명)가 있으면 그 지점들도 함께 표시한다.
+# -------------------------------
+@perf.cache_resource
+def load_map_html(pois_key, stations_key, ridership_key):
+    pois = pd.DataFrame(
+        [(f"{rank}. {name}", lat, lon, desc) for rank, name, lat, lon, desc in places],
+        columns=["이름", "위도", "경도", "설명"]
+    )
+    extra, _ = data.pois()
+    if extra is not None:
+        pois = pd.concat([pois, extra], ignore_index=True)
+
+    # 가장 가까운 역을 모든 지점에 대해 한 번에 찾고, 라벨도 열 단위로 만든다
+    idx, dist = station_index.query_many(pois["위도"], pois["경도"], k=1)
+    near = station_index.stations.iloc[idx[:, 0]][["역명", "노선"]].reset_index(drop=True)
+    near["거리_km"] = dist[:, 0]
+    pois["가까운역"] = station_labels(near.join(ridership, on="역명")).to_numpy()
+    far = int((near["거리_km"] > stations.MAX_NEAREST_KM).sum())
+    # 지도 HTML 은 한 번만 만들어 모든 rerun·세션이 같은 문자열을 쓴다
+    return poimap.map_html(pois, SEOUL_CENTER), len(pois), far
+
+with perf.phase("figure"):
+    pois_key = data.pois()[1]
+    map_html, poi_count, far_count = load_map_html(pois_key, stations_key, subway_signature)
 
 # 지도 출력 (80% 크기)
-st.markdown("### 🗺️ 서울 관광 명소 지도")
-st_folium(m, width=800, height=520)
+st.markdown(f"### 🗺️ 서울 관광 명소 지도 ({poi_count:,}곳)")
+if far_count:
+    st.warning(
+        f"{far_count:,}곳은 가장 가까운 역이 {stations.MAX_NEAREST_KM:g}km 넘게 떨어져 있습니다(⚠️). "
+        f"역 좌표표(stations.csv)에 {len(station_index):,}개 역만 있어 실제로 더 가까운 역이 빠졌을 수 있습니다."
+    )
+with perf.phase("render"):
+    st.iframe(map_html, width=800, height=520)
 
 # 관광지 간단 소개
 st.markdown("---")
 st.markdown("### 📍 관광지 간단 소개 & 전철역 안내")
-for rank, name, lat, lon, desc, station in places:
+for rank, name, lat, lon, desc in places:
+    station = station_labels(nearest[rank]).iloc[0]
     st.markdown(
         f"**{rank}. {name}** — {desc}  \n🚇 **가까운 전철역:** {station}"
     )
 
 st.markdown("---")
-st.caption("데이터 출처: VisitSeoul, TripAdvisor, Klook 등 (지도 좌표는 참고용)")
+st.markdown(f"### 🚇 관광지별 가까운 전철역 {NEAREST_K}곳 & 최근 {RECENT_DAYS}일 승·하차 인원")
+st.dataframe(
+    pd.concat(
+        {name: nearest[rank] for rank, name, lat, lon, desc in places},
+        names=["관광지", "순위"]
+    ).reset_index(level="순위", drop=True).reset_index(),
+    use_container_width=True
+)
+
+st.markdown("---")
+st.caption("데이터 출처: VisitSeoul, TripAdvisor, Klook 등 (지도 좌표는 참고용) · 가까운 역은 stations.csv 좌표로 자동 계산")
+
+perf.finish()
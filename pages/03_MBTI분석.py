@@ -1,19 +1,33 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import os
+import numpy as np
+
+from core import data, figcache, perf
+from core.mbti import MBTISimilarity
 
 st.set_page_config(page_title="세계 MBTI 분석", layout="wide")
+perf.begin(__file__)
 
 # ===================================================
-# 데이터 불러오기
+# 데이터 불러오기 (core.data)
+# 모든 세션이 같은 읽기 전용 핸들(메모리 맵 Arrow)을 공유한다.
+# CSV 내용이 바뀌면 키가 달라져 새로 읽는다.
 # ===================================================
-@st.cache_data
-def load_data():
-    path = os.path.join(os.path.dirname(__file__), "..", "countriesMBTI_16types.csv")
-    return pd.read_csv(path)
 
-df = load_data()
+# 순위 행렬(미리 만들어 둔 파일)·유형별 TOP N·국가별 정렬 순서를 한 번에 준비해 두고 탭에서는 읽기만 한다
+@perf.cache_resource
+def load_ranks(key):
+    return data.ranks(top_n=10)
+
+@perf.cache_resource
+def load_similarity(key):
+    return MBTISimilarity(data.mbti().df)
+
+with perf.phase("load"):
+    mbti = data.mbti()
+    data_key = mbti.key
+    ranks = load_ranks(data_key)
+    similarity = load_similarity(data_key)
+    df = mbti.df
 
 st.title("🌏 세계 MBTI 비율 분석")
 
@@ -21,10 +35,11 @@ st.title("🌏 세계 MBTI 비율 분석")
 # ===================================================
 # Tabs
 # ===================================================
-tab1, tab2, tab3 = st.tabs([
+tab1, tab2, tab3, tab4 = st.tabs([
     "📁 전체 데이터",
     "📊 국가별 MBTI 비율",
-    "🏆 MBTI 유형별 TOP 10 국가"  # ▶▶ 새로 추가한 탭
+    "🏆 MBTI 유형별 TOP 10 국가",
+    "🤝 비슷한 국가 찾기"
 ])
 
 
@@ -33,7 +48,12 @@ tab1, tab2, tab3 = st.tabs([
 # ===================================================
 with tab1:
     st.subheader("전체 국가 MBTI 비율 데이터")
-    st.dataframe(df)
+    if st.checkbox("비율 대신 유형별 순위(1위 = 비율이 가장 높은 국가)로 보기"):
+        with perf.phase("render"):
+            st.dataframe(ranks.rank_frame())
+    else:
+        with perf.phase("render"):
+            st.dataframe(df)
 
 
 # ===================================================
@@ -42,30 +62,27 @@ with tab1:
 with tab2:
     st.subheader("국가를 선택하면 MBTI 16유형 비율을 보여줍니다.")
 
-    country = st.selectbox("국가 선택", df["Country"].unique())
+    country = st.selectbox("국가 선택", mbti.keys())
 
-    row = df[df["Country"] == country].squeeze()
+    # 국가별 정렬 순서와 색(1위 빨강, 나머지 파란 계열)은 미리 계산되어 있다
+    # pyplot 은 figcache 에 PNG 가 없어 실제로 그릴 때만 import 한다
+    def country_chart():
+        import matplotlib.pyplot as plt
 
-    mbti_cols = [c for c in df.columns if c != "Country"]
-    values = row[mbti_cols].values
+        sorted_types, sorted_values = ranks.country_profile(country)
 
-    # 상위 1등은 빨강, 나머지 파란 계열
-    sorted_idx = values.argsort()[::-1]
-    colors = []
-    for i, idx in enumerate(sorted_idx):
-        if i == 0:
-            colors.append("red")
-        else:
-            blue_intensity = 0.1 + (0.9 * (1 - i / len(sorted_idx)))
-            colors.append((0, 0.3, blue_intensity))
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.bar(sorted_types, sorted_values, color=ranks.type_colors)
+        ax.set_title(f"{country} 의 MBTI 비율")
+        ax.set_ylabel("Percentage (%)")
+        ax.set_xticks(range(len(sorted_types)))
+        ax.set_xticklabels(sorted_types, rotation=45, ha="right")
+        return fig
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.bar([mbti_cols[i] for i in sorted_idx], [values[i] for i in sorted_idx], color=colors)
-    ax.set_title(f"{country} 의 MBTI 비율")
-    ax.set_ylabel("Percentage (%)")
-    ax.set_xticklabels([mbti_cols[i] for i in sorted_idx], rotation=45, ha="right")
-
-    st.pyplot(fig)
+    # 같은 국가 그래프는 한 번만 그려서 PNG 로 캐시 (세션 간 공유)
+    # 새로 그리는 시간은 figcache 가 figure 구간으로 따로 잰다
+    with perf.phase("render"):
+        st.image(figcache.png(("mbti", "country", data_key, country), country_chart))
 
 
 # ===================================================
@@ -74,21 +91,86 @@ with tab2:
 with tab3:
     st.subheader("MBTI 유형을 선택하면 해당 유형 비율이 높은 국가 TOP 10을 보여줍니다.")
     
-    mbti_list = [c for c in df.columns if c != "Country"]
-    selected_type = st.selectbox("MBTI 유형 선택", mbti_list)
+    selected_type = st.selectbox("MBTI 유형 선택", ranks.types)
+
+    def type_chart():
+        import matplotlib.pyplot as plt
 
-    # 선택한 유형 기준 상위 10개 국가
-    top10 = df[["Country", selected_type]].sort_values(by=selected_type, ascending=False).head(10)
+        # 선택한 유형 기준 상위 10개 국가 (미리 계산된 목록)
+        top_countries, top_values, top_is_korea = ranks.top_countries(selected_type)
 
-    # 색상: 한국만 빨간색
-    colors = ["red" if c.lower() in ["korea", "south korea"] else "gray" for c in top10["Country"]]
+        # 색상: 한국만 빨간색
+        colors = np.where(top_is_korea, "red", "gray")
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.bar(top10["Country"], top10[selected_type], color=colors)
-    ax.set_title(f"{selected_type} 비율 상위 10개 국가")
-    ax.set_ylabel("Percentage (%)")
-    ax.set_xticklabels(top10["Country"], rotation=45, ha="right")
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.bar(top_countries, top_values, color=colors)
+        ax.set_title(f"{selected_type} 비율 상위 10개 국가")
+        ax.set_ylabel("Percentage (%)")
+        ax.set_xticks(range(len(top_countries)))
+        ax.set_xticklabels(top_countries, rotation=45, ha="right")
+        return fig
 
-    st.pyplot(fig)
+    with perf.phase("render"):
+        st.image(figcache.png(("mbti", "type", data_key, selected_type), type_chart))
 
     st.markdown("🔴 한국(Korea, South Korea)은 자동으로 빨간색으로 표시됩니다.")
+
+
+# ===================================================
+# TAB 4: MBTI 분포가 비슷한 국가 찾기 + 유사도 히트맵
+# ===================================================
+with tab4:
+    st.subheader("국가 또는 직접 만든 MBTI 분포와 가장 비슷한 국가를 찾습니다.")
+
+    METRIC_LABELS = {"코사인 유사도": "cosine", "L1 거리": "l1"}
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        mode = st.radio("기준", ["국가", "직접 입력"], horizontal=True)
+    with col2:
+        metric = METRIC_LABELS[st.radio("비교 방법", list(METRIC_LABELS), horizontal=True)]
+    with col3:
+        k = st.slider("찾을 국가 수", min_value=1, max_value=30, value=10)
+
+    if mode == "국가":
+        base_country = st.selectbox("기준 국가", mbti.keys(), key="similar_country")
+        with perf.phase("aggregate"):
+            profile = similarity.vector(base_country)
+            nearest = similarity.nearest(profile, k=k, metric=metric, exclude=base_country)
+    else:
+        st.caption("16개 유형 비율을 입력하세요. (기본값은 전체 국가 평균)")
+        mean_profile = similarity.values.mean(axis=0)
+        cols = st.columns(4)
+        profile = np.array([
+            cols[j % 4].number_input(t, min_value=0.0, max_value=1.0, value=round(float(mean_profile[j]), 4),
+                                     step=0.005, format="%.4f", key=f"profile_{t}")
+            for j, t in enumerate(similarity.types)
+        ])
+        with perf.phase("aggregate"):
+            nearest = similarity.nearest(profile, k=k, metric=metric)
+
+    with perf.phase("render"):
+        st.dataframe(nearest, use_container_width=True)
+
+    if st.checkbox("전체 국가 유사도 히트맵 보기 (비슷한 국가끼리 모아서 정렬)"):
+        def heatmap_chart():
+            import matplotlib.pyplot as plt
+
+            order = similarity.cluster_order()
+            matrix = similarity.pairwise(metric)[np.ix_(order, order)]
+            labels = similarity.countries[order]
+
+            fig, ax = plt.subplots(figsize=(14, 12))
+            image = ax.imshow(matrix, cmap="viridis" if metric == "cosine" else "viridis_r")
+            ax.set_xticks(range(len(labels)))
+            ax.set_yticks(range(len(labels)))
+            ax.set_xticklabels(labels, rotation=90, fontsize=4)
+            ax.set_yticklabels(labels, fontsize=4)
+            ax.set_title("국가 간 MBTI 분포 " + ("코사인 유사도" if metric == "cosine" else "L1 거리"))
+            fig.colorbar(image, ax=ax, shrink=0.8)
+            return fig
+
+        with perf.phase("render"):
+            st.image(figcache.png(("mbti", "heatmap", data_key, metric), heatmap_chart, dpi=150))
+
+perf.finish()
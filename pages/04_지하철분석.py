@@ -1,97 +1,238 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from datetime import date
 import numpy as np
-import os
+
+from core import charts, data, figcache, frames, perf, ridership, subway_ingest
+
+perf.begin(__file__)
 
 # -------------------------------
-# 데이터 로드
+# 데이터 로드 (core.data)
+# 원본 폴더의 월별 CSV(subway*.csv)를 월 단위 Parquet 파티션으로 변환해 두고 읽는다.
+# 내용이 바뀐 파일만 다시 파싱하며, 키(signature)가 바뀌면 아래 캐시도 새로 만들어진다.
+# 노선명·역명은 범주형, 인원 수는 int32 로 압축해 워커당 메모리를 줄이고,
+# 메모리 맵 Arrow 핸들 하나를 모든 세션이 공유한다.
 # -------------------------------
-@st.cache_data
-def load_data():
-    # 현재 파일이 pages에 있기 때문에 상위 폴더의 CSV를 불러와야 함
-    current_dir = os.path.dirname(__file__)
-    csv_path = os.path.join(current_dir, "..", "subway.csv")
 
-    df = pd.read_csv(csv_path, encoding="cp949")
-    df["사용일자"] = pd.to_datetime(df["사용일자"], format="%Y%m%d")
-    return df
+# -------------------------------
+# (날짜, 호선) → 승·하차 TOP N 인덱스
+# 역별 합계·순위는 미리 만들어 둔 집계(core.data.station_totals)를 쓴다.
+# 위젯을 바꿀 때마다 전체 데이터를 필터링·정렬하지 않고 딕셔너리 조회만 한다.
+# -------------------------------
+TOP_N = 10
 
-df = load_data()
+@perf.cache_resource
+def build_top_index(signature, top_n=TOP_N):
+    # (날짜, 호선, 역) 합계는 승하차합계 많은 순으로 정렬된 집계 파일에서 읽는다
+    totals = data.station_totals().df
+    index = {}
+    for (day, line), group in totals.groupby(["사용일자", "노선명"], sort=False, observed=True):
+        index[(day.date(), line)] = group.head(top_n).reset_index(drop=True)
+    return index
+
+# -------------------------------
+# 역별 시계열·이상치 — 모든 역을 한 번에 계산해 캐시
+# -------------------------------
+@perf.cache_resource
+def build_series(signature):
+    return ridership.RidershipSeries(data.station_totals().df)
+
+# 날짜 × 호선 승하차 합계 (전체 호선 보기용)
+@perf.cache_resource
+def build_line_totals(signature):
+    return (
+        data.station_totals().df
+        .groupby(["사용일자", "노선명"], observed=True)["승하차합계"]
+        .sum()
+        .unstack("노선명")
+    )
+
+with perf.phase("load"):
+    subway, memory_report = data.ridership()
+    signature = subway.key
+    df = subway.df
+    top_index = build_top_index(signature)
+
+if df.empty:
+    st.error("⚠️ 지하철 승·하차 데이터(subway*.csv)를 찾을 수 없습니다.")
+    perf.stop()
+
+dates = subway.keys()
+first_date = dates[0].date()
+last_date = dates[-1].date()
 
 # -------------------------------
 # UI
 # -------------------------------
-st.title("📊 2025년 10월 지하철 승·하차 TOP10 분석")
+st.title("📊 지하철 승·하차 TOP10 분석")
 st.write("날짜와 호선을 선택하면 승·하차 인원이 가장 많은 10개 역을 보여줍니다.")
+st.caption(
+    f"데이터 기간: {first_date} ~ {last_date} (월 파티션 {', '.join(subway_ingest.partition_months())}) · "
+    + frames.format_report(memory_report)
+)
+
+view = st.radio("보기", ["일별 TOP10", "역별 추이·이상치", "전체 역·호선"], horizontal=True)
+
+# -------------------------------
+# 역별 추이·이상치 보기
+# -------------------------------
+if view == "역별 추이·이상치":
+    with perf.phase("load"):
+        series = build_series(signature)
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        station = st.selectbox("역 선택 (이용객 많은 순)", series.stations)
+    with col2:
+        threshold = st.slider("이상치 기준 |z|", min_value=2.0, max_value=10.0, value=5.0, step=0.5)
+
+    with perf.phase("filter"):
+        station_df = series.station(station)
+        flagged = station_df[station_df["z"].abs() >= threshold]
+
+    with perf.phase("figure"):
+        fig = go.Figure()
+        fig.add_trace(charts.line_trace(station_df.index, station_df["승하차합계"], name="일별 승·하차", mode="lines+markers"))
+        fig.add_trace(charts.line_trace(station_df.index, station_df["예상인원"],
+                                        name=f"예상 인원 (직전 {series.window}일 기준)", line=dict(dash="dot")))
+        fig.add_trace(go.Scatter(x=flagged.index, y=flagged["승하차합계"], mode="markers", name="이상치",
+                                 marker=dict(color="red", size=12, symbol="x")))
+        fig.update_layout(title=f"🚇 {station} 일별 승·하차 추이", template="plotly_white", height=450)
+    with perf.phase("render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        with perf.phase("figure"):
+            delta = station_df["전일대비"]
+            fig = go.Figure(go.Bar(x=delta.index, y=delta, marker=dict(color=np.where(delta >= 0, "red", "blue"))))
+            fig.update_layout(title="전일 대비 증감", template="plotly_white", height=350)
+        with perf.phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        with perf.phase("figure"):
+            profile = series.weekday_profile[station]
+            fig = go.Figure(go.Bar(x=profile.index, y=profile,
+                                   marker=dict(color=np.where(profile.index.isin(["토", "일"]), "orange", "steelblue"))))
+            weekend = series.weekend_profile.loc[station]
+            fig.update_layout(
+                title=f"요일별 평균 (평일 {weekend['평일']:,.0f}명 / 주말 {weekend['주말']:,.0f}명)",
+                template="plotly_white", height=350
+            )
+        with perf.phase("render"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("⚠️ 전체 역 이상치 목록")
+    with perf.phase("filter"):
+        anomalies = series.anomalies(threshold).head(100)
+    with perf.phase("render"):
+        st.dataframe(anomalies, use_container_width=True)
+    perf.stop()
 
-# 날짜 선택
+# -------------------------------
+# 전체 역·호선 보기 (막대 수백 개 + 역별 일별 시계열)
+# 큰 그래프는 WebGL·솎아내기·숫자 생략으로 브라우저에 보내는 JSON 크기를 제한한다.
+# -------------------------------
+if view == "전체 역·호선":
+    with perf.phase("load"):
+        series = build_series(signature)
+        line_totals = build_line_totals(signature)
+
+    whole = st.checkbox("기간 전체 합계", value=True)
+    if whole:
+        period = f"{first_date} ~ {last_date}"
+        with perf.phase("aggregate"):
+            station_totals = series.daily.sum()
+            line_sum = line_totals.sum()
+    else:
+        day = st.date_input("날짜 선택", value=first_date, min_value=first_date,
+                            max_value=last_date, key="all_date")
+        period = str(day)
+        with perf.phase("filter"):
+            station_totals = series.daily.loc[pd.Timestamp(day)].fillna(0)
+            line_sum = line_totals.reindex([pd.Timestamp(day)]).iloc[0].fillna(0)
+
+    def all_stations_chart():
+        ranked = station_totals.sort_values(ascending=False)
+        fig = go.Figure(charts.bar_trace(ranked.index.astype(str), ranked.to_numpy(),
+                                         colors=charts.gradient_colors(len(ranked))))
+        fig.update_layout(title=f"🚇 {period} | 전체 {len(ranked)}개 역 승·하차 총합",
+                          template="plotly_white", height=500, xaxis=dict(showticklabels=False))
+        return fig
+
+    def all_lines_chart():
+        ranked = line_sum.sort_values(ascending=False)
+        fig = go.Figure(charts.bar_trace(ranked.index.astype(str), ranked.to_numpy(),
+                                         colors=charts.gradient_colors(len(ranked))))
+        fig.update_layout(title=f"🚇 {period} | 호선별 승·하차 총합", template="plotly_white", height=500)
+        return fig
+
+    def all_series_chart():
+        fig = go.Figure(charts.multi_line_trace(
+            {name: (series.daily.index, series.daily[name].to_numpy()) for name in series.stations},
+            line=dict(width=1), opacity=0.4
+        ))
+        fig.update_layout(title=f"🚇 전체 {len(series.stations)}개 역 일별 승·하차 추이",
+                          template="plotly_white", height=600, showlegend=False)
+        return fig
+
+    # 그래프를 새로 만드는 시간은 figcache 가 figure 구간으로 따로 잰다
+    with perf.phase("render"):
+        st.plotly_chart(figcache.plotly(("subway", "all_stations", signature, period), all_stations_chart),
+                        use_container_width=True)
+        st.plotly_chart(figcache.plotly(("subway", "all_lines", signature, period), all_lines_chart),
+                        use_container_width=True)
+        st.plotly_chart(figcache.plotly(("subway", "all_series", signature), all_series_chart),
+                        use_container_width=True)
+    perf.stop()
+
+# 날짜 선택 (범위는 존재하는 파티션 기준)
 selected_date = st.date_input(
     "날짜 선택",
-    value=date(2025, 10, 1),
-    min_value=date(2025, 10, 1),
-    max_value=date(2025, 10, 31)
+    value=first_date,
+    min_value=first_date,
+    max_value=last_date
 )
 
 # 호선 선택
-lines = sorted(df["노선명"].unique())
+lines = sorted(df["노선명"].cat.categories)
 selected_line = st.selectbox("호선 선택", lines)
 
 # -------------------------------
-# 데이터 필터링
+# TOP 10 조회 (미리 만든 인덱스에서 바로 꺼냄)
 # -------------------------------
-filtered = df[
-    (df["사용일자"] == pd.Timestamp(selected_date)) &
-    (df["노선명"] == selected_line)
-].copy()
+with perf.phase("filter"):
+    top10 = top_index.get((selected_date, selected_line))
 
-if filtered.empty:
+if top10 is None:
     st.warning("⚠️ 해당 날짜와 호선에 대한 데이터가 없습니다.")
-    st.stop()
-
-filtered["승하차합계"] = filtered["승차총승객수"] + filtered["하차총승객수"]
-
-# TOP 10 추출
-top10 = filtered.sort_values("승하차합계", ascending=False).head(10)
-
-# -------------------------------
-# 색상 설정
-# 1위 = 빨간색, 나머지 = 파란색 → 흐려지는 그라데이션
-# -------------------------------
-colors = ["red"]  # 1위
-
-blue_start = np.array([0, 0, 255])      # 진한 파란색
-blue_end = np.array([200, 220, 255])    # 흐린 파란색
-
-gradient = [
-    f"rgb({int(c[0])}, {int(c[1])}, {int(c[2])})"
-    for c in [
-        blue_start + (blue_end - blue_start) * i
-        for i in np.linspace(0, 1, len(top10) - 1)
-    ]
-]
-
-colors.extend(gradient)
+    perf.stop()
 
 # -------------------------------
-# 그래프 생성 (Plotly)
+# 그래프는 (날짜, 호선) 별로 한 번만 만들어 JSON 으로 캐시한다 (세션 간 공유)
 # -------------------------------
-fig = go.Figure()
-fig.add_trace(go.Bar(
-    x=top10["역명"],
-    y=top10["승하차합계"],
-    marker=dict(color=colors),
-    text=top10["승하차합계"],
-    textposition="outside"
-))
-
-fig.update_layout(
-    title=f"🚇 {selected_date} | {selected_line} 승·하차 총합 TOP10",
-    xaxis_title="역명",
-    yaxis_title="승·하차 인원",
-    template="plotly_white",
-    height=600
-)
-
-st.plotly_chart(fig, use_container_width=True)
+def top10_chart():
+    # 색상: 1위 = 빨간색, 나머지 = 파란색 → 흐려지는 그라데이션 (NumPy 로 한 번에 생성)
+    colors = charts.gradient_colors(len(top10), start=(0, 0, 255), end=(200, 220, 255))
+
+    # 그래프 생성 (Plotly)
+    fig = go.Figure()
+    fig.add_trace(charts.bar_trace(top10["역명"], top10["승하차합계"], colors=colors))
+
+    fig.update_layout(
+        title=f"🚇 {selected_date} | {selected_line} 승·하차 총합 TOP10",
+        xaxis_title="역명",
+        yaxis_title="승·하차 인원",
+        template="plotly_white",
+        height=600
+    )
+    return fig
+
+with perf.phase("render"):
+    st.plotly_chart(
+        figcache.plotly(("subway", "top10", signature, selected_date, selected_line), top10_chart),
+        use_container_width=True
+    )
+
+perf.finish()
@@ -1,71 +1,86 @@
 import os
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from collections import Counter
+
+from core import alerts, charts, data, districts, frames, perf, search, sources
 
 st.set_page_config(page_title="부산 안내문자 통계", layout="wide")
+perf.begin(__file__)
 st.title("📊 부산광역시 구별 안내문자 통계")
 
 
 # ------------------------------------------------------------
-# 1) CSV 파일 경로 (pages → 상위 루트)
+# 1) 데이터 로드 + 대상지역에서 구/군 이름 파싱 (core.data)
+# 파일 내용 해시가 키이므로 내용이 바뀔 때만 다시 읽고 파싱한다.
+# 구/군 파싱 결과((안내문자, 구) 긴 형식 표)와 집계 큐브도 미리 만들어 둔 파일을 모든 세션이 공유한다.
 # ------------------------------------------------------------
-CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "gagagaga.CSV")
+ALERTS_PATH = sources.path(data.ALERTS_CSV)
+
+if not os.path.exists(ALERTS_PATH):
+    st.error(f"CSV 파일을 찾을 수 없습니다: {ALERTS_PATH}")
+    perf.stop()
+
+# 구 → 해당 구 대상 안내문자 번호 배열 (검색 결과 구 필터용)
+@perf.cache_resource
+def load_gu_alerts(key):
+    long = data.alert_gu().df
+    return {
+        gu: group["alert"].to_numpy()
+        for gu, group in long.groupby("구", observed=True)
+    }
+
+# 본문 검색 색인은 워커에 하나만 두고, 파일이 바뀌면 늘어난 행만 더한다.
+# 색인은 모든 키가 함께 쓰므로 키별로 캐시하지 않고, 색인에 기록된 키와 다를 때마다 맞춘다
+# (파일이 A→B→A 로 돌아가도 B 의 행이 남지 않는다).
+@perf.cache_resource
+def get_search_index():
+    return search.AlertSearchIndex()
+
+with perf.phase("load"):
+    dataset, memory_report = data.alerts()
+    data_key = dataset.key
+    df = dataset.df
+
+st.success(f"데이터 로드 완료 — 총 {len(df)}행 ({frames.format_report(memory_report)})")
 
-if not os.path.exists(CSV_PATH):
-    st.error(f"CSV 파일을 찾을 수 없습니다: {CSV_PATH}")
-    st.stop()
+if "대상지역" not in df.columns:
+    st.error("CSV에 '대상지역' 컬럼이 없습니다.")
+    perf.stop()
+
+BUSAN_GU_LIST = alerts.BUSAN_GU_LIST
+# (시간 구간 × 구 × 재난유형) 집계 큐브 — 필터를 바꿀 때는 큐브를 자르고 더하기만 한다
+with perf.phase("load"):
+    day_cube = data.alert_cube("D")
+
+# 기간·재난유형 필터
+first_day = day_cube.buckets[0].date()
+last_day = day_cube.buckets[-1].date()
+start_day, end_day = st.slider(
+    "기간 선택",
+    min_value=first_day,
+    max_value=last_day,
+    value=(first_day, last_day),
+    format="YYYY-MM-DD"
+)
+selected_types = st.multiselect("재난유형 선택 (비우면 전체)", day_cube.types)
 
-try:
-    df = pd.read_csv(CSV_PATH, encoding="cp949")
-except:
-    df = pd.read_csv(CSV_PATH, encoding="utf-8", errors="ignore")
+start = pd.Timestamp(start_day)
+stop = pd.Timestamp(end_day) + pd.Timedelta(days=1)
 
-st.success(f"데이터 로드 완료 — 총 {len(df)}행")
+with perf.phase("aggregate"):
+    gu_counts = day_cube.by_gu(start, stop, types=selected_types)
 
+    result_df = pd.DataFrame({
+        "구": BUSAN_GU_LIST,
+        "안내문자수": gu_counts.to_numpy()
+    })
 
-# ------------------------------------------------------------
-# 2) 대상지역에서 구/군 이름 파싱
-# ------------------------------------------------------------
-if "대상지역" not in df.columns:
-    st.error("CSV에 '대상지역' 컬럼이 없습니다.")
-    st.stop()
-
-BUSAN_GU_LIST = [
-    "중구","서구","동구","영도구","부산진구","동래구","남구","북구","해운대구",
-    "사하구","금정구","강서구","연제구","수영구","사상구","기장군"
-]
-
-def clean_name(x):
-    if not isinstance(x, str):
-        return ""
-    x = x.replace("부산광역시", "").replace(" ", "").replace("　", "")
-    return x
-
-all_gu = []
-for row in df["대상지역"].dropna():
-    items = [i.strip() for i in str(row).split(",") if i.strip() != ""]
-    for item in items:
-        name = clean_name(item)
-        if name in BUSAN_GU_LIST:
-            all_gu.append(name)
-        else:
-            if name.endswith("구") or name.endswith("군"):
-                all_gu.append(name)
-            elif name == "기장":
-                all_gu.append("기장군")
-
-gu_counter = Counter(all_gu)
-
-result_df = pd.DataFrame({
-    "구": BUSAN_GU_LIST,
-    "안내문자수": [gu_counter.get(g, 0) for g in BUSAN_GU_LIST]
-})
-
-result_df = result_df.sort_values("안내문자수", ascending=False).reset_index(drop=True)
+    result_df = result_df.sort_values("안내문자수", ascending=False).reset_index(drop=True)
 st.subheader("📌 구별 안내문자 집계")
-st.dataframe(result_df)
+with perf.phase("render"):
+    st.dataframe(result_df)
 
 
 # ------------------------------------------------------------
@@ -88,14 +103,151 @@ result_df["color"] = result_df["구"].apply(color_map)
 # 4) Plotly 막대그래프
 # ------------------------------------------------------------
 st.subheader("📊 막대그래프")
-fig_bar = px.bar(
-    result_df,
-    x="구",
-    y="안내문자수",
-    text="안내문자수",
-    color="color",
-    color_discrete_map="identity",
-    title="부산 구별 안내문자 수"
-)
-fig_bar.update_traces(textposition="outside")
-st.plotly_chart(fig_bar, use_container_width=True)
+with perf.phase("figure"):
+    fig_bar = px.bar(
+        result_df,
+        x="구",
+        y="안내문자수",
+        text="안내문자수",
+        color="color",
+        color_discrete_map="identity",
+        title="부산 구별 안내문자 수"
+    )
+    fig_bar.update_traces(textposition="outside")
+with perf.phase("render"):
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+
+# ------------------------------------------------------------
+# 4-1) 구별 단계구분도
+# 경계(busan_gu.geojson)는 한 번 단순화해 캐시해 두고(core.districts),
+# 정적 파일 제공이 켜져 있으면 그래프에는 경계 파일 URL 만 넣는다.
+# Feature id 가 BUSAN_GU_LIST 위치이므로 필터를 바꾸면 gu_counts 배열에서 값만 꺼내 다시 칠한다.
+# ------------------------------------------------------------
+st.subheader("🗺️ 구별 안내문자 지도")
+with perf.phase("load"):
+    district_geo, district_key = data.districts()
+
+if district_geo is None:
+    st.info(f"구/군 경계 파일({data.DISTRICTS_GEOJSON})을 데이터 폴더에 넣으면 지도로도 볼 수 있습니다.")
+else:
+    map_value = st.radio("지도 값", ["안내문자 수", "하루 평균"], horizontal=True, key="map_value")
+    geo_ids = districts.ids(district_geo)
+    values = gu_counts.to_numpy()[geo_ids]
+    if map_value == "하루 평균":
+        values = values / max((stop - start).days, 1)
+
+    # 정적 파일 제공이 꺼져 있거나(.streamlit/config.toml) static 폴더에 쓸 수 없으면
+    # 경계를 그래프에 직접 넣는다
+    geo_url = (
+        districts.static_url(district_geo, district_key)
+        if st.get_option("server.enableStaticServing") else None
+    )
+    geojson = geo_url or district_geo
+    with perf.phase("figure"):
+        fig_map = charts.choropleth(
+            geojson, geo_ids, values, np.asarray(BUSAN_GU_LIST)[geo_ids], map_value,
+            value_format=",.0f" if map_value == "안내문자 수" else ",.2f"
+        )
+    with perf.phase("render"):
+        st.plotly_chart(fig_map, use_container_width=True)
+
+
+# ------------------------------------------------------------
+# 5) 구별 기간 추이 (일/시간 단위)
+# ------------------------------------------------------------
+st.subheader("📈 기간별 안내문자 추이")
+col1, col2 = st.columns(2)
+with col1:
+    trend_gu = st.selectbox("구 선택", ["전체"] + BUSAN_GU_LIST)
+with col2:
+    granularity = st.radio("단위", ["일", "시간"], horizontal=True)
+
+with perf.phase("load"):
+    trend_cube = day_cube if granularity == "일" else data.alert_cube("h")
+with perf.phase("aggregate"):
+    trend = trend_cube.series(
+        start, stop,
+        gu=None if trend_gu == "전체" else trend_gu,
+        types=selected_types
+    )
+with perf.phase("figure"):
+    fig_line = px.line(
+        x=trend.index,
+        y=trend.to_numpy(),
+        labels={"x": "송출 시각" if granularity == "시간" else "일자", "y": "안내문자수"},
+        title=f"{trend_gu} 안내문자 추이 ({granularity} 단위)"
+    )
+with perf.phase("render"):
+    st.plotly_chart(fig_line, use_container_width=True)
+
+
+# ------------------------------------------------------------
+# 6) 재난유형별 분포
+# ------------------------------------------------------------
+st.subheader("🧩 재난유형별 안내문자 수")
+with perf.phase("aggregate"):
+    type_counts = day_cube.by_type(start, stop, gu=None if trend_gu == "전체" else trend_gu)
+    if selected_types:
+        type_counts = type_counts[type_counts.index.isin(selected_types)]
+
+with perf.phase("figure"):
+    fig_type = px.bar(
+        x=type_counts.to_numpy(),
+        y=type_counts.index,
+        orientation="h",
+        labels={"x": "안내문자수", "y": "재난유형"},
+        title=f"{trend_gu} 재난유형별 안내문자 수"
+    )
+    fig_type.update_layout(yaxis=dict(autorange="reversed"), height=max(400, 24 * len(type_counts)))
+with perf.phase("render"):
+    st.plotly_chart(fig_type, use_container_width=True)
+
+
+
+# ------------------------------------------------------------
+# 7) 안내문자 본문 검색
+# ------------------------------------------------------------
+st.subheader("🔎 안내문자 본문 검색")
+st.caption('여러 단어는 모두 포함하는 문자를 찾고, "따옴표"로 감싸면 구절 그대로 찾습니다. 위에서 고른 기간이 적용됩니다.')
+
+PAGE_SIZE = 20
+
+col1, col2 = st.columns([3, 1])
+with col1:
+    query = st.text_input("검색어", placeholder='예: 태풍 "해안가 접근"')
+with col2:
+    search_gu = st.selectbox("대상 구", ["전체"] + BUSAN_GU_LIST, key="search_gu")
+
+if query:
+    with perf.phase("load"):
+        index = get_search_index()
+        if index.key != data_key:
+            index.sync(df["송출내용"], key=data_key)
+        gu_alerts = load_gu_alerts(data_key) if search_gu != "전체" else None
+
+    with perf.phase("filter"):
+        hits = index.search(query)
+
+        # 기간·구 필터
+        days = df["일자"].to_numpy()
+        hits = hits[(days[hits] >= start.to_datetime64()) & (days[hits] < stop.to_datetime64())]
+        if gu_alerts is not None:
+            hits = hits[np.isin(hits, gu_alerts.get(search_gu, []))]
+
+        # 최신 문자부터
+        sent = df["전송시간"].fillna(df["일자"]).to_numpy()
+        hits = hits[np.argsort(sent[hits], kind="stable")[::-1]]
+
+    total_pages = max(1, -(-len(hits) // PAGE_SIZE))
+    page = st.number_input("페이지", min_value=1, max_value=total_pages, value=1, step=1)
+    st.write(f"검색 결과 {len(hits)}건 (페이지 {page}/{total_pages})")
+
+    shown = hits[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+    with perf.phase("render"):
+        st.dataframe(
+            df.iloc[shown][["전송시간", "재난유형", "대상지역", "송출내용"]].reset_index(drop=True),
+            use_container_width=True
+        )
+
+perf.finish()
@@ -0,0 +1,53 @@
+import json
+import os
+
+from core import districts
+from core.alerts import BUSAN_GU_LIST
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "busan_gu_sample.geojson")
+
+
+def _points(geo):
+    return sum(len(ring) for f in geo["features"] for poly in f["geometry"]["coordinates"] for ring in poly)
+
+
+def test_simplify_file_keeps_busan_only_and_merges_by_gu():
+    geo = districts.simplify_file(FIXTURE)
+
+    # 서울 중구는 빠지고, 동 단위로 나뉜 해운대구는 하나의 Feature 로 모인다
+    names = [f["properties"]["name"] for f in geo["features"]]
+    assert names == ["중구", "부산진구", "해운대구"]
+    haeundae = geo["features"][-1]["geometry"]
+    assert haeundae["type"] == "MultiPolygon"
+    assert len(haeundae["coordinates"]) == 2
+
+
+def test_simplify_file_reduces_points():
+    with open(FIXTURE, encoding="utf-8") as f:
+        source = json.load(f)
+    busan = [f for f in source["features"] if f["properties"]["SIG_CD"].startswith("26")]
+    before = sum(len(ring) for f in busan for ring in f["geometry"]["coordinates"])
+
+    geo = districts.simplify_file(FIXTURE)
+    assert 0 < _points(geo) < before / 2
+
+
+def test_ids_are_busan_gu_list_positions():
+    geo = districts.simplify_file(FIXTURE)
+    ids = districts.ids(geo)
+    assert ids.tolist() == [BUSAN_GU_LIST.index(g) for g in ("중구", "부산진구", "해운대구")]
+    assert [f["properties"]["name"] for f in geo["features"]] == [BUSAN_GU_LIST[i] for i in ids]
+
+
+def test_static_url_returns_none_when_static_dir_is_not_writable(tmp_path, monkeypatch):
+    blocker = tmp_path / "static"
+    blocker.write_text("")  # 디렉터리 자리에 파일이 있어 만들 수 없다
+    monkeypatch.setattr(districts, "STATIC_DIR", str(blocker / "geo"))
+
+    geo = districts.simplify_file(FIXTURE)
+    assert districts.static_url(geo, "key") is None
+
+    monkeypatch.setattr(districts, "STATIC_DIR", str(tmp_path / "geo"))
+    url = districts.static_url(geo, "key")
+    assert url.startswith(districts.STATIC_URL)
+    assert os.path.exists(tmp_path / "geo" / os.path.basename(url))
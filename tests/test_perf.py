@@ -0,0 +1,23 @@
+import os
+
+from core import perf
+
+
+def test_remove_dead_files_keeps_live_processes(tmp_path):
+    pattern = str(tmp_path / "reruns.{pid}.jsonl")
+    dead = 2 ** 22 + 12345  # pid_max 보다 커서 살아 있을 수 없는 번호
+    live = os.getpid()
+    names = [
+        f"reruns.{dead}.jsonl", f"reruns.{dead}.jsonl.1", f"reruns.{dead}.jsonl.3",
+        f"reruns.{dead}.jsonl.77.tmp",
+        f"reruns.{live}.jsonl", f"reruns.{live}.jsonl.1",
+        "reruns.abc.jsonl", "other.txt",
+    ]
+    for name in names:
+        (tmp_path / name).write_text("")
+
+    perf._remove_dead_files(pattern)
+
+    assert sorted(os.listdir(tmp_path)) == sorted([
+        f"reruns.{live}.jsonl", f"reruns.{live}.jsonl.1", "reruns.abc.jsonl", "other.txt",
+    ])
@@ -0,0 +1,47 @@
+import math
+
+from core.search import AlertSearchIndex
+
+
+def test_sync_rebuilds_when_an_earlier_row_changes():
+    index = AlertSearchIndex()
+    assert index.sync(["a태풍", "b", "c"]) == 3
+
+    # 마지막 행이 아닌 중간 행이 바뀌면 처음부터 다시 색인해야 한다
+    assert index.sync(["a태풍", "X변경", "c", "d"]) == 4
+    assert index.search("변경").tolist() == [1]
+    assert index.search("b").tolist() == []
+
+
+def test_sync_appends_only_new_rows():
+    index = AlertSearchIndex()
+    index.sync(["태풍 주의", "호우 경보"])
+    assert index.sync(["태풍 주의", "호우 경보", "태풍 경보"]) == 1
+    assert index.search("태풍").tolist() == [0, 2]
+
+
+def test_sync_appends_after_non_string_row():
+    index = AlertSearchIndex()
+    index.sync(["태풍", math.nan])
+
+    # 빈 본문(NaN)이 마지막 행이어도 늘어난 행만 색인한다
+    assert index.sync(["태풍", math.nan, "호우"]) == 1
+    assert index.search("호우").tolist() == [2]
+
+
+def test_sync_with_key_follows_reverted_data():
+    index = AlertSearchIndex()
+    a = ["태풍 주의", "호우 경보"]
+    b = a + ["폭염 주의", "한파 경보"]
+    index.sync(a, key="A")
+    index.sync(b, key="B")
+    assert index.search("한파").tolist() == [3]
+
+    # 같은 키면 다시 비교하지 않는다
+    assert index.sync(b, key="B") == 0
+
+    # A 로 되돌아가면 B 에만 있던 행이 남지 않는다
+    index.sync(a, key="A")
+    assert len(index) == 2
+    assert index.key == "A"
+    assert index.search("한파").tolist() == []